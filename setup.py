@@ -25,7 +25,7 @@ setup(
     author_email="aca-it@uw.edu",
     include_package_data=True,
     install_requires=[
-        'uw-restclients-core',
+        'uw-restclients-core>=1.4',
         'nameparser',
     ],
     license='Apache License, Version 2.0',
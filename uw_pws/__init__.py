@@ -6,16 +6,31 @@ This is the interface for interacting with the Person Web Service.
 """
 
 from io import BytesIO as streamIO
+from logging import getLogger
+import time
 from urllib.parse import urlencode
 import json
 import re
 from restclients_core.exceptions import (
     InvalidRegID, InvalidNetID, InvalidEmployeeID, DataFailureException)
+from restclients_core.util.retry import retry
+from uw_pws.deadline import check_deadline, deadline, remaining
 from uw_pws.exceptions import (
     InvalidStudentNumber, InvalidStudentSystemKey, InvalidIdCardPhotoSize,
-    InvalidProxRFID)
-from uw_pws.dao import PWS_DAO
+    InvalidProxRFID, DeadlineExceeded)
+from uw_pws.cache import StaleWhileRevalidateCache, TTLCache, get_cache
+from uw_pws.hedge import HEDGE_WORKERS, Hedger
 from uw_pws.models import Person, Entity
+from uw_pws.photo import (
+    MASTER_SIZE, can_resize, photo_height, resize_photo)
+from uw_pws.search import (
+    ADAPTIVE, DEFAULT_PAGE_SIZE, PageSizeTuner, SearchCursor,
+    observe_page_size, page_size_of, parse_person_page, search_key,
+    with_page_size)
+from uw_pws.transfer import accept_encoding, decode_response
+from uw_pws.validation import (
+    RE_NETID, RE_REGID, RE_EMPLOYEE_ID, RE_STUDENT_NUMBER,
+    RE_STUDENT_SYSTEM_KEY, RE_PROX_RFID, validate_batch)
 
 
 PERSON_PREFIX = '/identity/v2/person'
@@ -23,21 +38,43 @@ ENTITY_PREFIX = '/identity/v2/entity'
 CARD_PREFIX = '/idcard/v1/card'
 PHOTO_PREFIX = '/idcard/v1/photo'
 
+# Statuses worth retrying a search page for
+RETRY_STATUS_CODES = [0, 500, 502, 503, 504]
+
+logger = getLogger(__name__)
+
+_NO_CARD = object()
+_MISS = object()
+
+
+def __getattr__(name):
+    # uw_pws.PWS_DAO, without importing the DAO with the package
+    if name == "PWS_DAO":
+        from uw_pws.dao import PWS_DAO
+        return PWS_DAO
+    raise AttributeError("module {} has no attribute {}".format(
+        __name__, name))
+
 
 class PWS(object):
     """
     The PWS object has methods for getting person information.
+
+    A parse_executor (a concurrent.futures thread or process pool) decodes
+    person search pages in its workers while the next page is requested.
     """
-    def __init__(self, actas=None):
+    def __init__(self, actas=None, parse_executor=None):
         self.actas = actas
-        # netid format:
-        #     https://wiki.cac.washington.edu/display/SMW/UW+NetID+Namespace
-        self._re_netid = re.compile(r'^[a-z][a-z0-9\-\_\.]{,127}$', re.I)
-        self._re_regid = re.compile(r'^[A-F0-9]{32}$', re.I)
-        self._re_employee_id = re.compile(r'^\d{9}$')
-        self._re_student_number = re.compile(r'^\d{7}$')
-        self._re_student_system_key = re.compile(r'^\d{9}$')
-        self._re_prox_rfid = re.compile(r'^\d{16}$')
+        self.parse_executor = parse_executor
+        self._re_netid = RE_NETID
+        self._re_regid = RE_REGID
+        self._re_employee_id = RE_EMPLOYEE_ID
+        self._re_student_number = RE_STUDENT_NUMBER
+        self._re_student_system_key = RE_STUDENT_SYSTEM_KEY
+        self._re_prox_rfid = RE_PROX_RFID
+        # The DAO brings in urllib3 and prometheus_client, which are slow to
+        # import, so wait until a client is made
+        from uw_pws.dao import PWS_DAO
         self.dao = PWS_DAO()
 
     def get_person_by_regid(self, regid):
@@ -50,7 +87,8 @@ class PWS(object):
             raise InvalidRegID(regid)
 
         url = "{}/{}/full.json".format(PERSON_PREFIX, regid.upper())
-        return Person.from_json(self._get_resource(url))
+        return Person.from_json(
+            self._get_cached_resource("get_person_by_regid", url))
 
     def get_person_by_netid(self, netid):
         """
@@ -62,7 +100,8 @@ class PWS(object):
             raise InvalidNetID(netid)
 
         url = "{}/{}/full.json".format(PERSON_PREFIX, netid.lower())
-        return Person.from_json(self._get_resource(url))
+        return Person.from_json(
+            self._get_cached_resource("get_person_by_netid", url))
 
     def get_person_by_employee_id(self, employee_id):
         """
@@ -75,11 +114,11 @@ class PWS(object):
 
         url = "{}.json?{}&verbose=on".format(
             PERSON_PREFIX, urlencode({"employee_id": employee_id}))
-        data = self._get_resource(url)
+        data = json.loads(self._get_lookup_data(url))
 
         # Search does not return a full person resource
         if not len(data["Persons"]):
-            raise DataFailureException(url, 404, "No person found")
+            self._raise_not_found(url, "No person found")
         return Person.from_json(data["Persons"][0])
 
     def get_person_by_student_number(self, student_number):
@@ -93,15 +132,16 @@ class PWS(object):
 
         url = "{}.json?{}&verbose=on".format(
             PERSON_PREFIX, urlencode({"student_number": student_number}))
-        data = self._get_resource(url)
+        data = json.loads(self._get_lookup_data(url))
 
         # Search does not return a full person resource
         if not len(data["Persons"]):
-            raise DataFailureException(url, 404, "No person found")
+            self._raise_not_found(url, "No person found")
 
         return Person.from_json(data["Persons"][0])
 
-    def person_search(self, **kwargs):
+    def person_search(self, cursor=None, timeout=None, cache=False,
+                      **kwargs):
         """
         Returns a list of Person objects
         Parameters can be:
@@ -131,77 +171,342 @@ class PWS(object):
         title=
         email=
         page_start=
+        page_size={rows per page, or "adaptive"}
+
+        Passing a SearchCursor from person_search_pages returns the rest of
+        that search instead.  With a timeout, a DeadlineExceeded is raised
+        if the whole search takes longer than that many seconds.  With
+        cache True, the results of the same search made in the last
+        RESTCLIENTS_PWS_SEARCH_CACHE_TTL seconds are returned.
         """
-        # Boolean params must be lowercased
-        params = [(k, str(v).lower() if isinstance(v, bool) else v) for (
-            k, v) in kwargs.items()]
-        url = "{}.json?{}&page_size=250&verbose=on".format(
-            PERSON_PREFIX, urlencode(params))
+        with deadline(timeout):
+            if cache and cursor is None:
+                return self._cached_search(
+                    "persons", Person, self._person_search, **kwargs)
+            return self._person_search(cursor, **kwargs)
+
+    def _person_search(self, cursor=None, **kwargs):
+        if self.parse_executor is not None:
+            return self._parallel_person_search(cursor, **kwargs)
 
         persons = []
+        for page, page_cursor in self.person_search_pages(cursor, **kwargs):
+            persons.extend(page)
+        return persons
 
-        while True:
-            data = self._get_resource(url)
+    def person_search_pages(self, cursor=None, **kwargs):
+        """
+        Yields a tuple of the Person objects on each page of
+        person_search(**kwargs), and a SearchCursor for the pages after it.
+        Passing a saved cursor resumes the search where it left off.
+        """
+        page_size, tuner = self._search_page_size(
+            kwargs.pop("page_size", None))
+        if cursor is None:
+            cursor = SearchCursor(self._person_search_url(page_size, **kwargs))
 
-            if len(data["Persons"]) > 0:
-                for person_data in data.get("Persons"):
-                    persons.append(Person.from_json(person_data))
+        for data, cursor in self._search_pages(cursor, "Persons", tuner):
+            yield ([Person.from_json(person_data) for person_data in data.get(
+                "Persons", [])], cursor)
 
-            if data.get("Next") is not None and len(data["Next"]["Href"]) > 0:
-                url = data["Next"]["Href"]
-            else:
-                break
+    def _parallel_person_search(self, cursor=None, **kwargs):
+        """
+        Returns the persons of a search, with each page parsed by the
+        parse_executor as soon as it arrives, in page order.
+        """
+        from concurrent.futures import (
+            ProcessPoolExecutor, TimeoutError as FutureTimeoutError)
+
+        # Only a process pool needs persons handed back as bytes
+        as_bytes = isinstance(self.parse_executor, ProcessPoolExecutor)
+        page_size, tuner = self._search_page_size(
+            kwargs.pop("page_size", None))
+        if cursor is None:
+            cursor = SearchCursor(self._person_search_url(page_size, **kwargs))
+        search_url = cursor.href
+        futures = []
+        try:
+            for data, cursor in self._search_pages(cursor, "Persons", tuner):
+                futures.append(self.parse_executor.submit(
+                    parse_person_page, data.get("Persons") or [], as_bytes))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        persons = []
+        try:
+            for future in futures:
+                if as_bytes:
+                    persons.extend(Person.from_bytes(person_data) for (
+                        person_data) in future.result(remaining()))
+                else:
+                    persons.extend(future.result(remaining()))
+        except (TimeoutError, FutureTimeoutError):
+            raise DeadlineExceeded(search_url)
+        finally:
+            for future in futures:
+                future.cancel()
         return persons
 
-    def get_person_by_prox_rfid(self, prox_rfid):
+    def _person_search_url(self, page_size, **kwargs):
+        # Boolean params must be lowercased
+        params = [(k, str(v).lower() if isinstance(v, bool) else v) for (
+            k, v) in kwargs.items()]
+        return "{}.json?{}&page_size={}&verbose=on".format(
+            PERSON_PREFIX, urlencode(params), page_size)
+
+    def _search_page_size(self, page_size=None):
+        """
+        Returns the first page size of a search, and a PageSizeTuner if the
+        page size is adaptive.
+        """
+        if page_size is None:
+            page_size = self.dao.get_service_setting(
+                "SEARCH_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+
+        if page_size == ADAPTIVE:
+            return DEFAULT_PAGE_SIZE, PageSizeTuner(
+                target_seconds=float(self.dao.get_service_setting(
+                    "SEARCH_PAGE_SECONDS", 1.0)),
+                max_bytes=int(self.dao.get_service_setting(
+                    "SEARCH_PAGE_BYTES", 4 * 1024 * 1024)))
+
+        page_size = int(page_size)
+        if page_size < 1:
+            raise ValueError("Invalid page_size: {}".format(page_size))
+        return page_size, None
+
+    def _search_pages(self, cursor, key, tuner=None):
+        """
+        Yields each decoded page from cursor on, with the cursor for the
+        pages after it.  key names the list of rows on a page.
+        """
+        while not cursor.done:
+            start = time.perf_counter()
+            raw = self._get_search_page_data(cursor.href)
+            seconds = time.perf_counter() - start
+            observe_page_size(key.lower(), page_size_of(cursor.href) or 0)
+            data = json.loads(raw)
+
+            href = None
+            if data.get("Next") is not None and len(data["Next"]["Href"]) > 0:
+                href = self._next_search_href(
+                    data["Next"]["Href"], cursor.href, seconds, len(raw),
+                    data.get("MaxResultSize"), tuner)
+
+            cursor = SearchCursor(href, cursor.pages + 1,
+                                  cursor.rows + len(data.get(key) or []))
+            yield data, cursor
+
+    def _next_search_href(self, href, url, seconds, size_bytes, max_size,
+                          tuner):
+        """
+        Returns the href of the page after url, resized by the tuner from
+        how long url took and its size.
+        """
+        if href is None or tuner is None:
+            return href
+        page_size = page_size_of(url) or DEFAULT_PAGE_SIZE
+        return with_page_size(href, tuner.next_size(
+            page_size, seconds, size_bytes, int(max_size or 0)))
+
+    def _get_search_page_data(self, url):
+        """
+        Returns a search page, making up to RESTCLIENTS_PWS_SEARCH_PAGE_TRIES
+        attempts when PWS is unavailable.
+        """
+        tries = int(self.dao.get_service_setting("SEARCH_PAGE_TRIES", 1))
+        delay = float(self.dao.get_service_setting(
+            "SEARCH_PAGE_RETRY_DELAY", 1))
+        # The delays retry will sleep, which it doubles after each try
+        delays = [delay * 2 ** i for i in range(tries - 1)]
+
+        def get_page(url):
+            try:
+                return self._get_resource_data(url)
+            except DataFailureException as ex:
+                if delays and ex.status in RETRY_STATUS_CODES:
+                    # Rather than sleep past the deadline
+                    wait, left = delays.pop(0), remaining()
+                    if left is not None and wait >= left:
+                        raise DeadlineExceeded(url)
+                raise
+
+        return retry(DataFailureException, tries=tries, delay=delay,
+                     status_codes=RETRY_STATUS_CODES, logger=logger)(
+            get_page)(url)
+
+    def get_person_by_prox_rfid(self, prox_rfid, timeout=None):
         """
         Returns a restclients.Person object for the given rfid.  If the rfid
         isn't found, or if there is an error communicating with the IdCard WS,
-        a DataFailureException will be thrown.
+        a DataFailureException will be thrown.  With a timeout, a
+        DeadlineExceeded is raised if both requests take longer than that
+        many seconds.
         """
         if not self.valid_prox_rfid(prox_rfid):
             raise InvalidProxRFID(prox_rfid)
 
+        with deadline(timeout):
+            return self.get_person_by_regid(self._get_regid_by_prox_rfid(
+                prox_rfid))
+
+    def get_persons_by_prox_rfids(self, prox_rfids, timeout=None):
+        """
+        Returns a dict of restclients.Person objects keyed on each of the
+        given rfids, with a value of None for rfids that have no card.
+        Cached card mappings are resolved without a request, and each
+        person is requested once.  The IdCard WS looks up one rfid a
+        request, so each uncached rfid is still a request of its own.
+        """
+        prox_rfids = list(prox_rfids)
+        for prox_rfid in prox_rfids:
+            if not self.valid_prox_rfid(prox_rfid):
+                raise InvalidProxRFID(prox_rfid)
+
+        with deadline(timeout):
+            return self._get_persons_by_prox_rfids(prox_rfids)
+
+    def _get_persons_by_prox_rfids(self, prox_rfids):
+
+        regids = {}
+        for prox_rfid in prox_rfids:
+            try:
+                regids[prox_rfid] = self._get_regid_by_prox_rfid(prox_rfid)
+            except DataFailureException as ex:
+                if ex.status != 404:
+                    raise
+                regids[prox_rfid] = None
+
+        persons = {}
+        for regid in set(regids.values()):
+            if regid is not None:
+                persons[regid] = self.get_person_by_regid(regid)
+
+        return {prox_rfid: persons.get(regid) for (
+            prox_rfid, regid) in regids.items()}
+
+    def _get_regid_by_prox_rfid(self, prox_rfid):
+        """
+        Returns the regid on the card for the given rfid, using the
+        mapping cache configured by RESTCLIENTS_PWS_PROX_RFID_CACHE_TTL and
+        RESTCLIENTS_PWS_PROX_RFID_NEGATIVE_CACHE_TTL.
+        """
         url = "{}.json?{}".format(
             CARD_PREFIX, urlencode({"prox_rfid": prox_rfid}))
-        data = self._get_resource(url)
-        if not len(data["Cards"]):
-            raise DataFailureException(url, 404, "No card found")
+
+        ttl = int(self.dao.get_service_setting("PROX_RFID_CACHE_TTL", 0))
+        negative_ttl = int(self.dao.get_service_setting(
+            "PROX_RFID_NEGATIVE_CACHE_TTL", 0))
+        cache = None
+        if ttl or negative_ttl:
+            cache = get_cache("prox_rfid", TTLCache, ttl, 10000)
+            regid = cache.get(str(prox_rfid))
+            if regid is _NO_CARD:
+                raise DataFailureException(url, 404, "No card found")
+            if regid is not None:
+                return regid
+
+        try:
+            data = self._get_resource(url)
+            if not len(data["Cards"]):
+                raise DataFailureException(url, 404, "No card found")
+        except DataFailureException as ex:
+            if ex.status == 404 and cache is not None and negative_ttl:
+                cache.set(str(prox_rfid), _NO_CARD, ttl=negative_ttl)
+            raise
 
         regid = data["Cards"][0]["RegID"]
-        return self.get_person_by_regid(regid)
+        if cache is not None and ttl:
+            cache.set(str(prox_rfid), regid)
+        return regid
 
-    def entity_search(self, **kwargs):
+    def entity_search(self, cursor=None, timeout=None, cache=False,
+                      **kwargs):
         """
         Returns a list of Person objects
         Parameters can be:
         display_name=
         is_test_entity={true/false}
         changed_since_date=YYYY-MM-DD+hh:mm:ss (5 minutes ago up to 24 hours)
+        page_size={rows per page, or "adaptive"}
+
+        Passing a SearchCursor from entity_search_pages returns the rest of
+        that search instead.  With a timeout, a DeadlineExceeded is raised
+        if the search and entity requests take longer than that many
+        seconds.  With cache True, the results of the same search made in
+        the last RESTCLIENTS_PWS_SEARCH_CACHE_TTL seconds are returned.
         """
-        # Boolean params must be lowercased
-        params = [(k, str(v).lower() if isinstance(v, bool) else v) for (
-            k, v) in kwargs.items()]
-        url = "{}.json?{}&page_size=250".format(
-            ENTITY_PREFIX, urlencode(params))
+        with deadline(timeout):
+            if cache and cursor is None:
+                return self._cached_search(
+                    "entities", Entity, self._entity_search, **kwargs)
+            return self._entity_search(cursor, **kwargs)
 
+    def _entity_search(self, cursor=None, **kwargs):
         entities = []
-
-        while True:
-            data = self._get_resource(url)
-
-            if len(data["Entities"]) > 0:
-                for result_data in data.get("Entities"):
-                    uwnetid = result_data.get("UWNetID")
-                    if uwnetid:
-                        entities.append(self.get_entity_by_netid(uwnetid))
-
-            if data.get("Next") is not None and len(data["Next"]["Href"]) > 0:
-                url = data["Next"]["Href"]
-            else:
-                break
+        for page, page_cursor in self.entity_search_pages(cursor, **kwargs):
+            entities.extend(page)
         return entities
 
+    def _cached_search(self, resource, model, search, **kwargs):
+        """
+        Returns search(**kwargs), served from the search result cache when
+        the same search was made in the last RESTCLIENTS_PWS_SEARCH_CACHE_TTL
+        seconds.  The cache keeps only the uwregids each search found, and
+        the results are kept by uwregid, so that results found by several
+        searches are kept once.  If any result has since been dropped, the
+        search is made again.  Searches and results are kept apart for
+        each PWS host and actas.
+        """
+        ttl = int(self.dao.get_service_setting("SEARCH_CACHE_TTL", 300))
+        searches = get_cache("search_results", TTLCache, ttl, int(
+            self.dao.get_service_setting("SEARCH_CACHE_SIZE", 1000)))
+        records = get_cache("search_records", TTLCache, ttl, int(
+            self.dao.get_service_setting("SEARCH_CACHE_RECORDS", 100000)))
+
+        host = self.dao.get_service_setting("HOST")
+        key = search_key(resource, kwargs, host, self.actas)
+        regids = searches.get(key)
+        if regids is not None:
+            found = [records.get((host, self.actas, resource, regid)) for (
+                regid) in regids]
+            if None not in found:
+                return [model.from_bytes(data) for data in found]
+
+        results = search(**kwargs)
+        if all(result.uwregid for result in results):
+            regids = [result.uwregid.upper() for result in results]
+            for regid, result in zip(regids, results):
+                records.set((host, self.actas, resource, regid),
+                            result.to_bytes())
+            searches.set(key, regids)
+        return results
+
+    def entity_search_pages(self, cursor=None, **kwargs):
+        """
+        Yields a tuple of the Entity objects on each page of
+        entity_search(**kwargs), and a SearchCursor for the pages after it.
+        Passing a saved cursor resumes the search where it left off.
+        """
+        page_size, tuner = self._search_page_size(
+            kwargs.pop("page_size", None))
+        if cursor is None:
+            # Boolean params must be lowercased
+            params = [(k, str(v).lower() if isinstance(v, bool) else v) for (
+                k, v) in kwargs.items()]
+            cursor = SearchCursor("{}.json?{}&page_size={}".format(
+                ENTITY_PREFIX, urlencode(params), page_size))
+
+        for data, cursor in self._search_pages(cursor, "Entities", tuner):
+            entities = []
+            for result_data in data.get("Entities", []):
+                uwnetid = result_data.get("UWNetID")
+                if uwnetid:
+                    entities.append(self.get_entity_by_netid(uwnetid))
+            yield entities, cursor
+
     def get_entity_by_regid(self, regid):
         """
         Returns a restclients.Entity object for the given regid.  If the
@@ -212,7 +517,8 @@ class PWS(object):
             raise InvalidRegID(regid)
 
         url = "{}/{}.json".format(ENTITY_PREFIX, regid.upper())
-        return Entity.from_json(self._get_resource(url))
+        return Entity.from_json(
+            self._get_cached_resource("get_entity_by_regid", url))
 
     def get_entity_by_netid(self, netid):
         """
@@ -224,7 +530,8 @@ class PWS(object):
             raise InvalidNetID(netid)
 
         url = "{}/{}.json".format(ENTITY_PREFIX, netid.lower())
-        return Entity.from_json(self._get_resource(url))
+        return Entity.from_json(
+            self._get_cached_resource("get_entity_by_netid", url))
 
     def get_idcard_photo(self, regid, size="medium"):
         """
@@ -251,23 +558,164 @@ class PWS(object):
                 raise InvalidNetID(self.actas)
             headers["X-UW-Act-as"] = self.actas
 
-        response = self.dao.getURL(url, headers)
+        ttl = int(self.dao.get_service_setting("PHOTO_RESIZE_TTL", 0))
+        if ttl and can_resize():
+            return streamIO(self._get_resized_photo(
+                regid.upper(), size, headers, ttl))
 
-        if response.status != 200:
-            raise DataFailureException(url, response.status, response.data)
+        def load():
+            return self._get_resource_data(url, headers)
+
+        cache = self._get_swr_cache("get_idcard_photo")
+        if cache is not None:
+            return streamIO(cache.get((url, self.actas), load))
 
-        return streamIO(response.data)
+        return streamIO(load())
+
+    def _get_resized_photo(self, regid, size, headers, ttl):
+        """
+        Returns the photo of a size, resized from a master photo fetched
+        once per regid.  Sizes larger than the master are fetched, and
+        replace it.
+        """
+        height = photo_height(size)
+        variants = get_cache("photo_variants", TTLCache, ttl, 5000)
+        key = (regid, self.actas, height)
+        data = variants.get(key)
+        if data is not None:
+            return data
+
+        masters = get_cache("photo_masters", TTLCache, ttl, 1000)
+        master = masters.get((regid, self.actas))
+        if master is None or master[0] < height:
+            master_size = MASTER_SIZE if (
+                height <= photo_height(MASTER_SIZE)) else size
+            master = (photo_height(master_size), self._get_resource_data(
+                "{}/{}-{}.jpg".format(PHOTO_PREFIX, regid, master_size),
+                headers))
+            masters.set((regid, self.actas), master)
+
+        data = master[1] if master[0] == height else resize_photo(
+            master[1], height)
+        variants.set(key, data)
+        return data
 
     def _get_resource(self, url,
                       header={"Accept": "application/json",
                               'Connection': 'keep-alive'}):
-        response = self.dao.getURL(url, header)
+        # Search does not return a full person resource
+        return json.loads(self._get_resource_data(url, header))
+
+    def _get_resource_data(self, url,
+                           header={"Accept": "application/json",
+                                   'Connection': 'keep-alive'}):
+        check_deadline(url)
+
+        encoding = self.dao.get_service_setting("ACCEPT_ENCODING", None)
+        if encoding:
+            header = dict(header)
+            header["Accept-Encoding"] = accept_encoding(encoding)
+
+        try:
+            response = self.dao.getURL(url, header)
+        except DataFailureException:
+            # A Live request may have timed out at the deadline
+            check_deadline(url)
+            raise
 
         if response.status != 200:
             raise DataFailureException(url, response.status, response.data)
 
-        # Search does not return a full person resource
-        return json.loads(response.data)
+        try:
+            return decode_response(response)
+        except ValueError as ex:
+            raise DataFailureException(url, response.status, str(ex))
+
+    def _get_lookup_data(self, url):
+        """
+        Returns the data of a single person or entity lookup.  A 404 is
+        remembered for RESTCLIENTS_PWS_NEGATIVE_CACHE_TTL seconds, for
+        the actas, so that repeated misses are raised without a request.
+        """
+        negative_cache = self._get_negative_cache()
+        if negative_cache is None:
+            return self._get_resource_data(url)
+
+        msg = negative_cache.get((url, self.actas), _MISS)
+        if msg is not _MISS:
+            raise DataFailureException(url, 404, msg)
+        try:
+            return self._get_resource_data(url)
+        except DataFailureException as ex:
+            if ex.status == 404:
+                negative_cache.set((url, self.actas), ex.msg)
+            raise
+
+    def _raise_not_found(self, url, msg):
+        """
+        Raises a 404 DataFailureException for a lookup at url that found no
+        one, remembering it as _get_lookup_data remembers a 404.
+        """
+        negative_cache = self._get_negative_cache()
+        if negative_cache is not None:
+            negative_cache.set((url, self.actas), msg)
+        raise DataFailureException(url, 404, msg)
+
+    def _get_negative_cache(self):
+        ttl = int(self.dao.get_service_setting("NEGATIVE_CACHE_TTL", 0))
+        if ttl:
+            return get_cache("negative", TTLCache, ttl, 10000)
+
+    def _get_cached_resource(self, method, url):
+        """
+        Returns the decoded resource at url, served through the
+        stale-while-revalidate cache when one is configured for method.
+        """
+        def load():
+            hedger = self._get_hedger(method)
+            if hedger is None:
+                return self._get_lookup_data(url)
+            return hedger.call(
+                lambda: self._get_lookup_data(url), method, url)
+
+        cache = self._get_swr_cache(method)
+        if cache is None:
+            return json.loads(load())
+
+        return json.loads(cache.get(url, load))
+
+    def _get_swr_cache(self, method):
+        """
+        Returns the shared stale-while-revalidate cache for method, as
+        configured by RESTCLIENTS_PWS_STALE_WHILE_REVALIDATE, e.g.
+            {"get_person_by_netid": {"soft_ttl": 60, "hard_ttl": 3600}}
+        """
+        config = self.dao.get_service_setting(
+            "STALE_WHILE_REVALIDATE", {}).get(method)
+        if not config:
+            return None
+
+        return get_cache(
+            "swr:{}".format(method), StaleWhileRevalidateCache,
+            config["soft_ttl"], config["hard_ttl"],
+            config.get("max_size", 1000))
+
+    def _get_hedger(self, method):
+        """
+        Returns the shared Hedger for method, as configured by
+        RESTCLIENTS_PWS_HEDGE, e.g.
+            {"get_person_by_netid": {"percentile": 95, "max_rate": 0.05}}
+        with duplicate requests sent on RESTCLIENTS_PWS_HEDGE_WORKERS
+        threads.
+        """
+        config = self.dao.get_service_setting("HEDGE", {}).get(method)
+        if not config:
+            return None
+
+        return get_cache(
+            "hedge:{}".format(method), Hedger, config.get("percentile", 95),
+            config.get("max_rate", 0.05), config.get("min_delay", 0.01),
+            int(self.dao.get_service_setting("HEDGE_WORKERS", HEDGE_WORKERS)))
 
     def valid_uwnetid(self, netid):
         return (netid is not None and
@@ -294,3 +742,29 @@ class PWS(object):
     def valid_prox_rfid(self, prox_rfid):
         return (prox_rfid is not None and
                 self._re_prox_rfid.match(str(prox_rfid)) is not None)
+
+    def valid_uwnetids(self, netids):
+        """
+        Validates a sequence of netids, returning a ValidationResult whose
+        valid values are lowercased.
+        """
+        return validate_batch(netids, self._re_netid, str.lower)
+
+    def valid_uwregids(self, regids):
+        """
+        Validates a sequence of regids, returning a ValidationResult whose
+        valid values are uppercased.
+        """
+        return validate_batch(regids, self._re_regid, str.upper)
+
+    def valid_employee_ids(self, employee_ids):
+        return validate_batch(employee_ids, self._re_employee_id)
+
+    def valid_student_numbers(self, student_numbers):
+        return validate_batch(student_numbers, self._re_student_number)
+
+    def valid_student_system_keys(self, system_keys):
+        return validate_batch(system_keys, self._re_student_system_key)
+
+    def valid_prox_rfids(self, prox_rfids):
+        return validate_batch(prox_rfids, self._re_prox_rfid)
@@ -0,0 +1,191 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+In-process caches shared by PWS client instances.
+"""
+
+from collections import OrderedDict
+from logging import getLogger
+import threading
+import time
+
+logger = getLogger(__name__)
+
+REFRESH_WORKERS = 2
+
+_refresh_executor = None
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class TTLCache(object):
+    """
+    A bounded, thread-safe LRU cache whose entries expire ttl seconds after
+    they are stored.
+    """
+    def __init__(self, ttl, max_size=1000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires = entry
+            if expires <= self._clock():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __len__(self):
+        return len(self._data)
+
+
+class StaleWhileRevalidateCache(object):
+    """
+    A cache that keeps serving an entry between its soft_ttl and hard_ttl
+    while a single background refresh per key replaces it.  Entries older
+    than hard_ttl are loaded synchronously.
+    """
+    def __init__(self, soft_ttl, hard_ttl, max_size=1000,
+                 clock=time.monotonic, executor=None):
+        if hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be less than soft_ttl")
+
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._executor = executor
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """
+        Returns the value cached for key, calling loader() to fill or
+        refresh it as needed.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+
+        if entry is not None:
+            value, stored = entry
+            age = self._clock() - stored
+            if age < self.soft_ttl:
+                return value
+
+            if age < self.hard_ttl:
+                self._refresh(key, loader)
+                return value
+
+        value = loader()
+        self._store(key, value)
+        return value
+
+    def wait_for_refreshes(self, timeout=None):
+        """
+        Blocks until the background refreshes in flight have finished.
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+        if futures:
+            from concurrent.futures import wait
+            wait(futures, timeout=timeout)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self._clock())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def _refresh(self, key, loader):
+        with self._lock:
+            if key in self._pending:
+                return
+
+            executor = self._executor or _get_refresh_executor()
+            self._pending[key] = executor.submit(
+                self._run_refresh, key, loader)
+
+    def _run_refresh(self, key, loader):
+        try:
+            self._store(key, loader())
+        except Exception as ex:
+            # The stale entry is served until it passes hard_ttl
+            logger.warning("Background refresh of {} failed: {}".format(
+                key, ex))
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+def _get_refresh_executor():
+    global _refresh_executor
+    if _refresh_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _refresh_executor = ThreadPoolExecutor(
+            max_workers=REFRESH_WORKERS, thread_name_prefix="pws-refresh")
+    return _refresh_executor
+
+
+def get_cache(name, cache_class, *args):
+    """
+    Returns the shared cache registered under name, creating it if it is
+    missing or was created with different arguments.
+    """
+    config = (cache_class,) + args
+    with _registry_lock:
+        entry = _registry.get(name)
+        if entry is None or entry[0] != config:
+            entry = (config, cache_class(*args))
+            _registry[name] = entry
+        return entry[1]
+
+
+def clear_caches():
+    """
+    Empties every shared cache.
+    """
+    with _registry_lock:
+        for config, cache in _registry.values():
+            cache.clear()
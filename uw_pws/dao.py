@@ -4,15 +4,58 @@
 """
 Contains UW PWS DAO implementations.
 """
-from restclients_core.dao import DAO
+from restclients_core.dao import DAO, LiveDAO
 from os.path import abspath, dirname
+from urllib3.util import Timeout
 import os
+from uw_pws.deadline import remaining
+from uw_pws.mock import FixtureDAO, FixtureStore
+
+RESOURCE_PATH = abspath(os.path.join(dirname(__file__), "resources"))
 
 
 class PWS_DAO(DAO):
+    def __init__(self):
+        super(PWS_DAO, self).__init__()
+        # Responses registered for this dao in Mock mode
+        self.fixtures = FixtureStore(self.service_name())
+
     def service_name(self):
         return 'pws'
 
     def service_mock_paths(self):
-        path = [abspath(os.path.join(dirname(__file__), "resources"))]
-        return path
+        return [RESOURCE_PATH]
+
+    def _get_live_implementation(self):
+        return DeadlineLiveDAO(self.service_name(), self)
+
+    def _get_mock_implementation(self):
+        return FixtureDAO(self.service_name(), self)
+
+
+class DeadlineLiveDAO(LiveDAO):
+    """
+    A LiveDAO whose requests wait no longer than the time left before the
+    current deadline.
+    """
+    def get_pool(self):
+        pool = super(DeadlineLiveDAO, self).get_pool()
+        left = remaining()
+        if left is None:
+            return pool
+        return _DeadlinePool(pool, max(left, 0.001))
+
+
+class _DeadlinePool(object):
+    """
+    A connection pool whose timeout is capped at seconds.  LiveDAO.load
+    passes the pool's timeout to each request.
+    """
+    def __init__(self, pool, seconds):
+        self._pool = pool
+        self.timeout = Timeout(
+            connect=min(pool.timeout.connect_timeout, seconds),
+            read=min(pool.timeout.read_timeout, seconds))
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
@@ -0,0 +1,62 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Deadlines shared by every PWS request made within a block:
+
+    with deadline(2.0):
+        persons = pws.person_search(last_name="smith")
+
+Each request made after the deadline raises DeadlineExceeded, and Live
+requests wait no longer than the time left.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from uw_pws.exceptions import DeadlineExceeded
+
+_deadline = ContextVar("pws_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Sets a deadline seconds from now for the block.  A nested deadline
+    can shorten, but not extend, the deadline around it.  None sets no
+    deadline.
+    """
+    if seconds is None:
+        yield
+        return
+
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """
+    Returns the seconds left before the current deadline, or None.
+    """
+    expires = _deadline.get()
+    if expires is not None:
+        return expires - time.monotonic()
+
+
+def check_deadline(url):
+    """
+    Raises DeadlineExceeded for url if the current deadline has passed,
+    and returns the seconds left, or None.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(url)
+    return left
@@ -20,3 +20,13 @@ class InvalidIdCardPhotoSize(Exception):
 class InvalidProxRFID(Exception):
     """Exception for invalid rfid."""
     pass
+
+
+class DeadlineExceeded(Exception):
+    """Exception for a request made, or cut short, after its deadline."""
+    def __init__(self, url):
+        super(DeadlineExceeded, self).__init__(url)
+        self.url = url
+
+    def __str__(self):
+        return "Deadline exceeded requesting {}".format(self.url)
@@ -0,0 +1,193 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Columnar export of person search results.
+
+Rows are built from the Person objects of each search page, one page at a
+time, so memory is bounded by the page size.  Columns follow
+Person.json_data, with nested values flattened:
+
+    list fields (addresses, phones, student_departments, ...) are joined
+    with the separator, "|" by default; a missing list stays None.
+
+    positions become three columns, positions_department,
+    positions_title and positions_is_primary, each joined with the
+    separator in position order.
+"""
+
+import csv
+
+STRING = "string"
+BOOL = "bool"
+
+PERSON_COLUMNS = (
+    ("uwnetid", STRING),
+    ("uwregid", STRING),
+    ("is_test_entity", BOOL),
+    ("first_name", STRING),
+    ("surname", STRING),
+    ("full_name", STRING),
+    ("display_name", STRING),
+    ("preferred_first_name", STRING),
+    ("preferred_middle_name", STRING),
+    ("preferred_surname", STRING),
+    ("pronouns", STRING),
+    ("whitepages_publish", BOOL),
+    ("employee_id", STRING),
+    ("addresses", STRING),
+    ("email_addresses", STRING),
+    ("faxes", STRING),
+    ("mobiles", STRING),
+    ("pagers", STRING),
+    ("phones", STRING),
+    ("voice_mails", STRING),
+    ("touch_dials", STRING),
+    ("positions_department", STRING),
+    ("positions_title", STRING),
+    ("positions_is_primary", STRING),
+    ("mailstop", STRING),
+    ("home_department", STRING),
+    ("publish_in_emp_directory", BOOL),
+    ("repository_time_stamp", STRING),
+    ("student_number", STRING),
+    ("student_system_key", STRING),
+    ("student_class", STRING),
+    ("student_departments", STRING),
+    ("publish_in_stu_directory", BOOL),
+    ("development_id", STRING),
+    ("alumni_state", STRING),
+    ("employee_state", STRING),
+    ("student_state", STRING),
+)
+
+PERSON_COLUMN_NAMES = tuple(name for name, kind in PERSON_COLUMNS)
+
+LIST_SEPARATOR = "|"
+
+_LIST_COLUMNS = frozenset((
+    "addresses", "email_addresses", "faxes", "mobiles", "pagers", "phones",
+    "voice_mails", "touch_dials", "student_departments"))
+
+# Position attributes by column
+_POSITION_COLUMNS = {
+    "positions_department": "department",
+    "positions_title": "title",
+    "positions_is_primary": "is_primary",
+}
+
+
+def iter_person_batches(pws, columns=None, separator=LIST_SEPARATOR,
+                        **kwargs):
+    """
+    Runs pws.person_search(**kwargs), yielding a dict of column lists for
+    each page of results.
+    """
+    indexes = _column_indexes(columns)
+    names = [PERSON_COLUMN_NAMES[i] for i in indexes]
+    for persons, cursor in pws.person_search_pages(**kwargs):
+        values = [[] for i in indexes]
+        for person in persons:
+            row = person_row(person, separator)
+            for column, i in zip(values, indexes):
+                column.append(row[i])
+        yield dict(zip(names, values))
+
+
+def iter_person_rows(pws, columns=None, separator=LIST_SEPARATOR, **kwargs):
+    """
+    Runs pws.person_search(**kwargs), yielding a tuple of column values for
+    each person.
+    """
+    indexes = _column_indexes(columns)
+    for persons, cursor in pws.person_search_pages(**kwargs):
+        for person in persons:
+            row = person_row(person, separator)
+            yield tuple(row[i] for i in indexes)
+
+
+def person_search_columns(pws, columns=None, separator=LIST_SEPARATOR,
+                          **kwargs):
+    """
+    Returns the results of pws.person_search(**kwargs) as a dict of column
+    lists.
+    """
+    names = [PERSON_COLUMN_NAMES[i] for i in _column_indexes(columns)]
+    table = {name: [] for name in names}
+    for batch in iter_person_batches(pws, columns, separator, **kwargs):
+        for name in names:
+            table[name].extend(batch[name])
+    return table
+
+
+def write_person_csv(pws, fileobj, columns=None, separator=LIST_SEPARATOR,
+                     **kwargs):
+    """
+    Writes the results of pws.person_search(**kwargs) to fileobj as CSV with
+    a header row, returning the number of persons written.
+    """
+    writer = csv.writer(fileobj)
+    writer.writerow(
+        [PERSON_COLUMN_NAMES[i] for i in _column_indexes(columns)])
+    count = 0
+    for row in iter_person_rows(pws, columns, separator, **kwargs):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_person_parquet(pws, where, columns=None, separator=LIST_SEPARATOR,
+                         **kwargs):
+    """
+    Writes the results of pws.person_search(**kwargs) to a Parquet file, one
+    row group per page, returning the number of persons written.  Requires
+    pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {STRING: pa.string(), BOOL: pa.bool_()}
+    schema = pa.schema([(PERSON_COLUMNS[i][0], types[PERSON_COLUMNS[i][1]])
+                        for i in _column_indexes(columns)])
+
+    count = 0
+    with pq.ParquetWriter(where, schema) as writer:
+        for batch in iter_person_batches(pws, columns, separator, **kwargs):
+            table = pa.Table.from_pydict(batch, schema=schema)
+            if table.num_rows:
+                writer.write_table(table)
+                count += table.num_rows
+    return count
+
+
+def person_row(person, separator=LIST_SEPARATOR):
+    """
+    Returns a tuple of PERSON_COLUMNS values for a Person.
+    """
+    row = []
+    for name, kind in PERSON_COLUMNS:
+        if name in _POSITION_COLUMNS:
+            attr = _POSITION_COLUMNS[name]
+            row.append(_join([getattr(position, attr) for (
+                position) in person.positions], separator))
+        elif name in _LIST_COLUMNS:
+            row.append(_join(getattr(person, name), separator))
+        else:
+            row.append(getattr(person, name))
+    return tuple(row)
+
+
+def _join(values, separator):
+    if values is None:
+        return None
+    return separator.join("" if v is None else str(v).lower() if (
+        isinstance(v, bool)) else str(v) for v in values)
+
+
+def _column_indexes(columns):
+    if columns is None:
+        return range(len(PERSON_COLUMNS))
+    try:
+        return [PERSON_COLUMN_NAMES.index(name) for name in columns]
+    except ValueError:
+        raise ValueError("Unknown column in {}".format(columns))
@@ -0,0 +1,165 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Hedged requests: when a request has not answered within a percentile of
+recent latencies, a duplicate is sent, and whichever answers first is used.
+"""
+
+from collections import deque
+from contextvars import copy_context
+import math
+import threading
+import time
+
+HEDGE_WORKERS = 16
+
+_executors = {}
+_executor_lock = threading.Lock()
+_hedge_counter = None
+
+
+class Hedger(object):
+    """
+    Hedges calls with the latencies of the last window calls.  A call that
+    takes longer than the percentile of them, and at least min_delay
+    seconds, is duplicated, as long as no more than max_rate of the last
+    window calls were.  Calls aren't hedged until min_samples latencies
+    are known, and the percentile is worked out again after every refresh
+    latencies.  Hedged calls and their duplicates are made on a pool of
+    workers threads.
+    """
+    def __init__(self, percentile=95, max_rate=0.05, min_delay=0.01,
+                 workers=HEDGE_WORKERS, window=1000, min_samples=20,
+                 refresh=50, clock=time.monotonic):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.workers = workers
+        self.min_samples = min_samples
+        self.refresh = refresh
+        self._clock = clock
+        self._latencies = deque(maxlen=window)
+        self._hedged = deque(maxlen=window)
+        self._delay = None
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """
+        Returns the seconds to wait before hedging, or None while there are
+        too few latencies to tell.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            if self._delay is None or self._added >= self.refresh:
+                latencies = sorted(self._latencies)
+                rank = max(int(math.ceil(
+                    self.percentile / 100.0 * len(latencies))), 1)
+                self._delay = max(latencies[rank - 1], self.min_delay)
+                self._added = 0
+            return self._delay
+
+    def call(self, fn, method, url):
+        """
+        Returns fn(), a request for url, called on a pool thread.  If it
+        hasn't answered within the hedge delay, fn is called again on
+        another, and the result of whichever succeeds first is returned,
+        the other being left to finish unused.  If both fail, the first
+        call's error is raised.  method labels the hedge metrics.
+        """
+        start = self._clock()
+        delay = self.delay()
+        if delay is None:
+            self._record_hedge(False)
+            return self._timed(fn, start)
+
+        from concurrent.futures import wait
+        from uw_pws.deadline import remaining
+
+        executor = _get_executor(self.workers)
+        calls = [executor.submit(copy_context().run, self._timed, fn, start)]
+        left = remaining()
+        wait(calls, delay if left is None else max(min(delay, left), 0))
+        if calls[0].done():
+            self._record_hedge(False)
+        elif self._allow_hedge():
+            _count_hedge(method, "fired")
+            calls.append(executor.submit(
+                copy_context().run, self._timed, fn, self._clock()))
+        return self._first_success(calls, method, url)
+
+    def clear(self):
+        with self._lock:
+            self._latencies.clear()
+            self._hedged.clear()
+            self._delay = None
+            self._added = 0
+
+    def _first_success(self, calls, method, url):
+        """
+        Returns the result of the first of calls to succeed, or raises the
+        first call's error if they all fail.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+        from uw_pws.deadline import remaining
+        from uw_pws.exceptions import DeadlineExceeded
+
+        pending = calls
+        while pending:
+            done, pending = wait(pending, remaining(), FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(url)
+            for call in calls:
+                if call in done and call.exception() is None:
+                    if call is not calls[0]:
+                        _count_hedge(method, "won")
+                    return call.result()
+        raise calls[0].exception()
+
+    def _timed(self, fn, start):
+        """
+        Returns fn(), keeping the seconds from start until it returned.
+        """
+        value = fn()
+        with self._lock:
+            self._latencies.append(self._clock() - start)
+            self._added += 1
+        return value
+
+    def _allow_hedge(self):
+        with self._lock:
+            allowed = sum(self._hedged) + 1 <= self.max_rate * (
+                len(self._hedged) + 1)
+            self._hedged.append(allowed)
+        return allowed
+
+    def _record_hedge(self, hedged):
+        with self._lock:
+            self._hedged.append(hedged)
+
+
+def _get_executor(workers):
+    with _executor_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="pws-hedge")
+            _executors[workers] = executor
+    return executor
+
+
+def _count_hedge(method, event):
+    """
+    Counts hedges fired, and won by the duplicate, in the
+    restclient_pws_hedges counter.
+    """
+    global _hedge_counter
+    if _hedge_counter is None:
+        from prometheus_client import Counter
+        _hedge_counter = Counter(
+            'restclient_pws_hedges', 'PWS hedged requests',
+            ['method', 'event'])
+    _hedge_counter.labels(method, event).inc()
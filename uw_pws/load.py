@@ -0,0 +1,168 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Drives the PWS client at a target rate, and reports throughput and latency
+percentiles.  Against the stand-in server in uw_pws.server:
+
+    python -m uw_pws.load --pws-host http://127.0.0.1:8000 --persons 100000 \\
+        --operation person --qps 200 --duration 30
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import math
+import random
+import tempfile
+import threading
+import time
+
+PERCENTILES = (50, 90, 95, 99)
+
+LoadReport = namedtuple("LoadReport", [
+    "requests", "errors", "seconds", "qps", "latencies"])
+
+
+def percentile(values, p):
+    """
+    Returns the pth percentile of sorted values, by nearest rank.
+    """
+    if not values:
+        return None
+    rank = max(int(math.ceil(p / 100.0 * len(values))), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+def run_load(call, qps, duration, workers=16, clock=time.monotonic):
+    """
+    Calls call(i) for i = 0, 1, ... at qps calls a second for duration
+    seconds, on up to workers threads, and returns a LoadReport.  Calls
+    are started on schedule, whether or not earlier calls have returned.
+    latencies maps each of PERCENTILES to seconds, timed from when each
+    call was scheduled, so that a call kept waiting for a thread counts
+    the wait.
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def timed(i, start):
+        try:
+            call(i)
+        except Exception:
+            with lock:
+                errors[0] += 1
+        finally:
+            with lock:
+                latencies.append(clock() - start)
+
+    interval = 1.0 / qps
+    total = int(qps * duration)
+    start = clock()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i in range(total):
+            scheduled = start + i * interval
+            wait = scheduled - clock()
+            if wait > 0:
+                time.sleep(wait)
+            executor.submit(timed, i, scheduled)
+    seconds = clock() - start
+
+    latencies.sort()
+    return LoadReport(
+        len(latencies), errors[0], seconds,
+        len(latencies) / seconds if seconds else 0.0,
+        {p: percentile(latencies, p) for p in PERCENTILES})
+
+
+def operations(pws, persons=0, seed=None):
+    """
+    Returns the named client calls to drive, each taking a call number.
+    With synthetic persons, calls pick one of them at random.
+    """
+    rand = random.Random(seed)
+
+    def netid(i):
+        return "user{}".format(rand.randint(1, persons)) if (
+            persons) else "javerage"
+
+    def regid(i):
+        return "{:032X}".format(rand.randint(1, persons)) if (
+            persons) else "9136CCB8F66711D5BE060004AC494FFE"
+
+    return {
+        "person": lambda i: pws.get_person_by_netid(netid(i)),
+        "entity": lambda i: pws.get_entity_by_netid(netid(i)),
+        "photo": lambda i: pws.get_idcard_photo(regid(i)),
+        "card": lambda i: pws.get_person_by_prox_rfid("1223221621633408"),
+        "search": lambda i: pws.person_search(first_name="user") if (
+            persons) else pws.person_search(changed_since_date=2019),
+    }
+
+
+def format_report(report):
+    lines = ["requests: {}, errors: {}, seconds: {:.2f}, qps: {:.1f}".format(
+        report.requests, report.errors, report.seconds, report.qps)]
+    for p, seconds in sorted(report.latencies.items()):
+        lines.append("p{}: {:.1f} ms".format(
+            p, seconds * 1000 if seconds is not None else float("nan")))
+    return "\n".join(lines)
+
+
+def use_settings(path=None):
+    """
+    Configures commonconf from the [PWS] section of the config file at
+    path, or with no settings.
+    """
+    from commonconf.backends import use_configparser_backend
+    if path:
+        use_configparser_backend(path, "PWS")
+    else:
+        with tempfile.NamedTemporaryFile("w", suffix=".cfg") as settings:
+            settings.write("[PWS]\n")
+            settings.flush()
+            use_configparser_backend(settings.name, "PWS")
+
+
+def pws_host_settings(host, pool_size):
+    """
+    Returns the settings overrides for using the Live PWS at host.
+    """
+    return {"RESTCLIENTS_PWS_DAO_CLASS": "Live",
+            "RESTCLIENTS_PWS_HOST": host,
+            "RESTCLIENTS_PWS_POOL_SIZE": pool_size}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--settings",
+                        help="config file with a [PWS] section of settings")
+    parser.add_argument("--pws-host",
+                        help="PWS to use instead of the settings, such as "
+                             "http://127.0.0.1:8000")
+    parser.add_argument("--operation", default="person",
+                        choices=sorted(operations(None)))
+    parser.add_argument("--persons", type=int, default=0,
+                        help="synthetic persons the server has")
+    parser.add_argument("--qps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    from commonconf import override_settings
+    use_settings(args.settings)
+
+    overrides = {}
+    if args.pws_host:
+        overrides = pws_host_settings(args.pws_host, args.workers)
+
+    from uw_pws import PWS
+    with override_settings(**overrides):
+        call = operations(PWS(), args.persons)[args.operation]
+        report = run_load(call, args.qps, args.duration, args.workers)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+An in-memory store of the PWS mock resources, used by PWS_DAO in Mock mode
+instead of reading the resource files on every request.  Tests can also
+register synthetic persons, entities and search results with a PWS_DAO.
+"""
+
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode
+import json
+from restclients_core.dao import MockDAO
+from restclients_core.models import MockHTTP
+from restclients_core.util.mock import load_resource_from_path
+from uw_pws.cache import TTLCache
+
+MAX_RESULT_SIZE = 500
+
+# The most responses read from the resource paths that are kept
+MAX_FIXTURES = 10000
+
+_MISSING = object()
+
+# Responses read from the resource paths, shared by all stores as they
+# never change
+_resources = TTLCache(float("inf"), MAX_FIXTURES)
+
+
+class FixtureStore(object):
+    """
+    Mock responses by url: those registered with the store, ahead of the
+    files in the resource paths.  Files are found by restclients_core's
+    mock file resolution, and the responses read from them are kept for
+    all stores, up to MAX_FIXTURES, the least recently used being
+    forgotten first.
+    """
+    def __init__(self, service_name="pws"):
+        self.service_name = service_name
+        self._lock = Lock()
+        self._registered = {}
+
+    def get(self, url, paths):
+        """
+        Returns a (status, data, headers) tuple for url from the registered
+        responses or the resource paths, or None.
+        """
+        with self._lock:
+            registered = self._registered.get(_normalize(url))
+        if registered is not None:
+            return registered
+
+        for path in paths:
+            key = (path, self.service_name, url)
+            resource = _resources.get(key, _MISSING)
+            if resource is _MISSING:
+                resource = self._load(path, url)
+                _resources.set(key, resource)
+            if resource is not None:
+                return resource
+
+    def register(self, url, data, status=200, headers=None):
+        """
+        Registers the response for url.  data can be bytes, or anything
+        json.dumps can encode.
+        """
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode("utf-8")
+        with self._lock:
+            self._registered[_normalize(url)] = (status, data, headers)
+
+    def unregister(self, url):
+        with self._lock:
+            self._registered.pop(_normalize(url), None)
+
+    def clear(self):
+        """
+        Forgets the registered responses.
+        """
+        with self._lock:
+            self._registered.clear()
+
+    def _load(self, path, url):
+        response = load_resource_from_path(
+            path, self.service_name, "file", url, {})
+        if response is None or response.status == 404:
+            return None
+        return response.status, response.data, response.headers
+
+
+def reload_resources():
+    """
+    Forgets the responses read from the resource paths.
+    """
+    _resources.clear()
+
+
+class FixtureDAO(MockDAO):
+    """
+    The Mock implementation of PWS_DAO, answering from the dao's fixture
+    store.
+    """
+    def load(self, method, url, headers, body):
+        if method != "GET":
+            return super(FixtureDAO, self).load(method, url, headers, body)
+
+        response = MockHTTP()
+        fixture = self.dao.fixtures.get(url, self._get_mock_paths())
+        if fixture is None:
+            response.status = 404
+            response.reason = "Not Found"
+        else:
+            response.status, response.data, fixture_headers = fixture
+            response.headers = dict(fixture_headers or {})
+        return response
+
+
+def register_person(dao, data):
+    """
+    Registers a person with dao, a PWS_DAO, given as PWS person JSON data,
+    by uwregid and uwnetid.
+    """
+    from uw_pws import PERSON_PREFIX
+    for key in (data["UWRegID"].upper(), data["UWNetID"].lower()):
+        dao.fixtures.register("{}/{}/full.json".format(
+            PERSON_PREFIX, key), data)
+
+
+def register_entity(dao, data):
+    """
+    Registers an entity with dao, a PWS_DAO, given as PWS entity JSON
+    data, by uwregid and uwnetid.
+    """
+    from uw_pws import ENTITY_PREFIX
+    for key in (data["UWRegID"].upper(), data["UWNetID"].lower()):
+        dao.fixtures.register("{}/{}.json".format(ENTITY_PREFIX, key), data)
+
+
+def register_person_search(dao, persons, page_size=None, **kwargs):
+    """
+    Registers with dao, a PWS_DAO, the pages of a
+    person_search(page_size=page_size, **kwargs) finding the given PWS
+    person JSON data.
+    """
+    from uw_pws import PWS
+    from uw_pws.search import DEFAULT_PAGE_SIZE
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    url = PWS()._person_search_url(page_size, **kwargs)
+
+    for start in range(0, max(len(persons), 1), page_size):
+        href = url if start == 0 else "{}&page_start={}".format(
+            url, start + 1)
+        dao.fixtures.register(href, search_page_data(
+            "Persons", persons[start:start + page_size], url, start + 1,
+            page_size, len(persons)))
+
+
+def search_page_data(key, rows, url, page_start, page_size, total):
+    """
+    Returns the JSON data for the search page starting at row page_start
+    (counting from 1) of url, holding rows under key.
+    """
+    next_start = page_start + page_size
+    return {
+        "TotalCount": total,
+        "PageSize": str(page_size),
+        "PageStart": str(page_start),
+        "MaxResultSize": MAX_RESULT_SIZE,
+        key: rows,
+        "Next": {
+            "Href": "{}&page_start={}".format(url, next_start),
+            "PageStart": str(next_start),
+            "PageSize": str(page_size),
+        } if next_start <= total else None,
+    }
+
+
+def synthetic_entity_data(index, **fields):
+    """
+    Returns PWS entity JSON data for a generated entity, numbered index,
+    with any other fields given.
+    """
+    data = {
+        "UWNetID": "user{}".format(index),
+        "UWRegID": "{:032X}".format(index),
+        "DisplayName": "User {}".format(index),
+        "IsTestEntity": True,
+        "PriorUWNetIDs": [],
+        "PriorUWRegIDs": [],
+    }
+    data.update(fields)
+    return data
+
+
+def synthetic_person_data(index, **fields):
+    """
+    Returns PWS person JSON data for a generated person, numbered index,
+    with any other fields given.
+    """
+    data = {
+        "UWNetID": "user{}".format(index),
+        "UWRegID": "{:032X}".format(index),
+        "DisplayName": "User {}".format(index),
+        "RegisteredName": "User {}".format(index),
+        "RegisteredFirstMiddleName": "User",
+        "RegisteredSurname": str(index),
+        "IsTestEntity": True,
+        "WhitepagesPublish": False,
+        "EduPersonAffiliations": ["member"],
+        "PriorUWNetIDs": [],
+        "PriorUWRegIDs": [],
+        "PersonAffiliations": {},
+    }
+    data.update(fields)
+    return data
+
+
+def _normalize(url):
+    path, _, query = url.partition("?")
+    if not query:
+        return path
+    return "{}?{}".format(path, urlencode(sorted(parse_qsl(
+        query, keep_blank_values=True))))
@@ -1,11 +1,84 @@
 # Copyright 2025 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from nameparser import HumanName
+from array import array
+from functools import lru_cache
+import hashlib
 from restclients_core import models
+from uw_pws import wire
 
+NAME_CACHE_SIZE = 10000
+DEFAULT_NAME_FORMAT = '{first} {middle} {last}'
 
-class Position(models.Model):
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class _FingerprintModel(models.Model):
+    """
+    A model with a fingerprint of its to_bytes encoding.
+    """
+    @property
+    def fingerprint(self):
+        """
+        A hash of the model's fields, for telling whether it changed.  It's
+        worked out on each access, so it always reflects the current
+        values, including lists and positions changed in place.
+        """
+        return _hash(self.to_bytes())
+
+
+def changed_fields(old, new):
+    """
+    Returns the set of fields that differ between two versions of a Person,
+    Position or Entity.  Fields are only compared when the fingerprints
+    differ.
+    """
+    if old.fingerprint == new.fingerprint:
+        return set()
+
+    old_data = old.json_data()
+    new_data = new.json_data()
+    for name in _DIFF_ATTRS.get(type(old).__name__, ()):
+        old_data[name] = getattr(old, name)
+        new_data[name] = getattr(new, name)
+    return {name for name, value in new_data.items() if (
+        old_data.get(name) != value)}
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def format_name(first_name, surname, string_format=DEFAULT_NAME_FORMAT):
+    """
+    Returns the capitalized name formatted with string_format.  Results
+    are kept in a bounded LRU cache shared by all persons.
+    """
+    # nameparser is slow to import, so wait until a name is needed
+    from nameparser import HumanName
+
+    name = HumanName("{} {}".format(first_name, surname))
+    name.capitalize()
+    name.string_format = string_format
+    return str(name)
+
+
+def format_names(persons, string_format=DEFAULT_NAME_FORMAT):
+    """
+    Returns the get_formatted_name value of each of persons, parsing each
+    distinct registered name once.
+    """
+    names = []
+    for person in persons:
+        display_name = person.display_name
+        if display_name and not display_name.isupper():
+            names.append(display_name)
+        else:
+            names.append(format_name(
+                person.first_name, person.surname, string_format))
+    return names
+
+
+class Position(_FingerprintModel):
     RETIREE = "retiree"
     department = models.CharField(max_length=250)
     title = models.CharField(max_length=250)
@@ -22,6 +95,26 @@ class Position(models.Model):
             'is_primary': self.is_primary,
         }
 
+    def to_bytes(self):
+        """
+        Returns the compact binary encoding of this position.
+        """
+        return wire.pack(
+            wire.POSITION, _POSITION_HEADER,
+            (wire.tristate(self.is_primary),), [self.department, self.title])
+
+    @staticmethod
+    def from_bytes(data):
+        (is_primary,), offset = wire.unpack_header(
+            data, wire.POSITION, _POSITION_HEADER)
+        return Position._from_slots(
+            wire.unpack_slots(data, offset, 2), is_primary)
+
+    @staticmethod
+    def _from_slots(slots, is_primary):
+        return Position(department=slots[0], title=slots[1],
+                        is_primary=wire.TRISTATE[is_primary])
+
     @staticmethod
     def from_json(data):
         position = Position()
@@ -31,10 +124,41 @@ class Position(models.Model):
         return position
 
 
-class Person(models.Model):
+_POSITION_HEADER = "<B"
+
+
+class Person(_FingerprintModel):
     CURRENT = "current"
     PRIOR = "prior"
 
+    # Bits of affiliation_flags
+    FLAG_STUDENT = 1 << 0
+    FLAG_STAFF = 1 << 1
+    FLAG_EMPLOYEE = 1 << 2
+    FLAG_ALUM = 1 << 3
+    FLAG_FACULTY = 1 << 4
+    FLAG_TEST_ENTITY = 1 << 5
+    FLAG_EMP_CURRENT = 1 << 6
+    FLAG_EMP_PRIOR = 1 << 7
+    FLAG_STUD_CURRENT = 1 << 8
+    FLAG_STUD_PRIOR = 1 << 9
+    FLAG_ALUM_CURRENT = 1 << 10
+    FLAG_ALUM_PRIOR = 1 << 11
+    FLAG_RETIREE = 1 << 12
+
+    # The keys of json_data, in order
+    JSON_FIELDS = (
+        'uwnetid', 'uwregid', 'is_test_entity', 'first_name', 'surname',
+        'full_name', 'display_name', 'preferred_first_name',
+        'preferred_middle_name', 'preferred_surname', 'pronouns',
+        'whitepages_publish', 'employee_id', 'addresses', 'email_addresses',
+        'faxes', 'mobiles', 'pagers', 'phones', 'voice_mails', 'touch_dials',
+        'positions', 'mailstop', 'home_department',
+        'publish_in_emp_directory', 'repository_time_stamp',
+        'student_number', 'student_system_key', 'student_class',
+        'student_departments', 'publish_in_stu_directory', 'development_id',
+        'alumni_state', 'employee_state', 'student_state')
+
     uwregid = models.CharField(max_length=32)
     uwnetid = models.CharField(max_length=128)
     first_name = models.CharField(max_length=100)
@@ -93,11 +217,36 @@ class Person(models.Model):
         return self.uwregid == other.uwregid
 
     def get_primary_position(self):
+        # Not cached: a position's is_primary can be changed in place, which
+        # the person can't see, and there are only a few positions to scan
         for position in self.positions:
             if position.is_primary:
                 return position
         return None
 
+    @property
+    def affiliation_flags(self):
+        """
+        An int of Person.FLAG_* bits for the affiliations and affiliation
+        states.  It's worked out on each access, so it's never stale;
+        PersonCollection keeps each person's flags for filtering.
+        """
+        flags = 0
+        for flag, name in _PERSON_FLAG_FIELDS:
+            if getattr(self, name):
+                flags |= flag
+        for name, current, prior in _PERSON_STATE_FLAG_FIELDS:
+            value = getattr(self, name)
+            if value == Person.CURRENT:
+                flags |= current
+            elif value == Person.PRIOR:
+                flags |= prior
+        if flags & Person.FLAG_EMP_CURRENT:
+            primary_pos = self.get_primary_position()
+            if primary_pos is not None and primary_pos.is_retiree():
+                flags |= Person.FLAG_RETIREE
+        return flags
+
     def is_alum_state_current(self):
         return (self.alumni_state is not None and
                 self.alumni_state == Person.CURRENT)
@@ -127,6 +276,8 @@ class Person(models.Model):
                 self.student_state == Person.PRIOR)
 
     def is_retiree(self):
+        # affiliation_flags has FLAG_RETIREE, but working out all the flags
+        # to read it would only add to this check
         primary_pos = self.get_primary_position()
         return (self.is_emp_state_current() and
                 primary_pos is not None and
@@ -171,15 +322,12 @@ class Person(models.Model):
             'student_state': self.student_state
         }
 
-    def get_formatted_name(self, string_format='{first} {middle} {last}'):
+    def get_formatted_name(self, string_format=DEFAULT_NAME_FORMAT):
         if (self.display_name is not None and len(self.display_name) and
                 not self.display_name.isupper()):
             return self.display_name
         else:
-            name = HumanName("{} {}".format(self.first_name, self.surname))
-            name.capitalize()
-            name.string_format = string_format
-            return str(name)
+            return format_name(self.first_name, self.surname, string_format)
 
     def get_first_last_name(self):
         """
@@ -194,6 +342,109 @@ class Person(models.Model):
 
         return self.first_name, self.surname
 
+    def to_bytes(self):
+        """
+        Returns the compact binary encoding of this person.
+        """
+        slots = [getattr(self, name) for name in _PERSON_TEXT_FIELDS]
+
+        affiliations = 0
+        for i, name in enumerate(_PERSON_AFFILIATION_FIELDS):
+            if getattr(self, name):
+                affiliations |= 1 << i
+
+        bools = 0
+        for i, name in enumerate(_PERSON_NULLABLE_BOOL_FIELDS):
+            bools |= wire.tristate(getattr(self, name)) << (2 * i)
+
+        states = 0
+        for i, name in enumerate(_PERSON_STATE_FIELDS):
+            value = getattr(self, name)
+            code = wire.state(value)
+            if code == wire.OTHER_STATE:
+                slots.append(value)
+            states |= code << (2 * i)
+
+        timestamp_code, timestamp = wire.timestamp(
+            self.repository_time_stamp)
+        slots.extend(timestamp)
+
+        counts = []
+        for name in _PERSON_LISTS:
+            values = getattr(self, name, None)
+            counts.append(wire.list_count(values))
+            if values is not None:
+                slots.extend(values)
+
+        positions = getattr(self, "positions", None) or []
+        counts.append(wire.list_count(positions))
+        primaries = []
+        position_slots = []
+        for position in positions:
+            primaries.append(str(wire.tristate(position.is_primary)))
+            position_slots.extend((position.department, position.title))
+        slots.append("".join(primaries))
+        slots.extend(position_slots)
+
+        return wire.pack(
+            wire.PERSON, _PERSON_HEADER,
+            [affiliations, bools, states, timestamp_code] + counts, slots)
+
+    @staticmethod
+    def from_bytes(data):
+        header, offset = wire.unpack_header(data, wire.PERSON, _PERSON_HEADER)
+        affiliations, bools, states, timestamp_code = header[:4]
+        counts = header[4:-1]
+        position_count = header[-1]
+
+        state_codes = [states >> (2 * i) & 3 for i in range(
+            len(_PERSON_STATE_FIELDS))]
+        count = (len(_PERSON_TEXT_FIELDS) +
+                 state_codes.count(wire.OTHER_STATE) +
+                 (timestamp_code != wire.TIMESTAMP_NONE) +
+                 sum(c for c in counts if c != wire.NO_LIST) +
+                 1 + 2 * position_count)
+        slots = wire.unpack_slots(data, offset, count)
+
+        person = Person()
+        i = len(_PERSON_TEXT_FIELDS)
+        for name, value in zip(_PERSON_TEXT_FIELDS, slots):
+            setattr(person, name, value)
+
+        for bit, name in enumerate(_PERSON_AFFILIATION_FIELDS):
+            setattr(person, name, bool(affiliations >> bit & 1))
+
+        for shift, name in enumerate(_PERSON_NULLABLE_BOOL_FIELDS):
+            setattr(person, name, wire.TRISTATE[bools >> (2 * shift) & 3])
+
+        for code, name in zip(state_codes, _PERSON_STATE_FIELDS):
+            if code == wire.OTHER_STATE:
+                setattr(person, name, slots[i])
+                i += 1
+            else:
+                setattr(person, name, wire.STATES[code])
+
+        if timestamp_code != wire.TIMESTAMP_NONE:
+            person.repository_time_stamp = wire.from_timestamp(
+                timestamp_code, slots[i])
+            i += 1
+
+        for name, list_count in zip(_PERSON_LISTS, counts):
+            if list_count == wire.NO_LIST:
+                setattr(person, name, None)
+            else:
+                setattr(person, name, slots[i:i + list_count])
+                i += list_count
+
+        primaries = slots[i]
+        i += 1
+        for is_primary in primaries:
+            person.positions.append(Position._from_slots(
+                slots[i:i + 2], int(is_primary)))
+            i += 2
+
+        return person
+
     @staticmethod
     def from_json(data):
         person = Person()
@@ -261,10 +512,97 @@ class Person(models.Model):
             alum_affil = person_affiliations.get('AlumPersonAffiliation')
             person.development_id = alum_affil.get('DevelopmentID')
             person.alumni_state = alum_affil.get("AlumAffiliationState")
+
         return person
 
 
-class Entity(models.Model):
+_PERSON_HEADER = "<BBBB12H"
+_PERSON_TEXT_FIELDS = (
+    "uwregid", "uwnetid", "first_name", "surname", "full_name",
+    "display_name", "preferred_first_name", "preferred_middle_name",
+    "preferred_surname", "pronouns", "employee_id", "mailstop",
+    "home_department", "student_number", "student_system_key",
+    "student_class", "development_id")
+_PERSON_AFFILIATION_FIELDS = (
+    "is_student", "is_staff", "is_employee", "is_alum", "is_faculty")
+_PERSON_NULLABLE_BOOL_FIELDS = (
+    "is_test_entity", "whitepages_publish", "publish_in_emp_directory",
+    "publish_in_stu_directory")
+_PERSON_STATE_FIELDS = ("employee_state", "student_state", "alumni_state")
+_PERSON_FLAG_FIELDS = (
+    (Person.FLAG_STUDENT, "is_student"),
+    (Person.FLAG_STAFF, "is_staff"),
+    (Person.FLAG_EMPLOYEE, "is_employee"),
+    (Person.FLAG_ALUM, "is_alum"),
+    (Person.FLAG_FACULTY, "is_faculty"),
+    (Person.FLAG_TEST_ENTITY, "is_test_entity"))
+_PERSON_STATE_FLAG_FIELDS = (
+    ("employee_state", Person.FLAG_EMP_CURRENT, Person.FLAG_EMP_PRIOR),
+    ("student_state", Person.FLAG_STUD_CURRENT, Person.FLAG_STUD_PRIOR),
+    ("alumni_state", Person.FLAG_ALUM_CURRENT, Person.FLAG_ALUM_PRIOR))
+_PERSON_LISTS = (
+    "prior_uwnetids", "prior_uwregids", "addresses", "email_addresses",
+    "faxes", "mobiles", "pagers", "phones", "touch_dials", "voice_mails",
+    "student_departments")
+
+
+class PersonCollection(object):
+    """
+    A sequence of Person objects, with each person's affiliation_flags
+    kept alongside for fast filtering, e.g. current employees who are not
+    retirees:
+
+        persons.filter(all_of=Person.FLAG_EMP_CURRENT,
+                       none_of=Person.FLAG_RETIREE)
+    """
+    def __init__(self, persons=()):
+        self._persons = list(persons)
+        self._flags = array("L", [p.affiliation_flags for p in self._persons])
+
+    def __len__(self):
+        return len(self._persons)
+
+    def __iter__(self):
+        return iter(self._persons)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._subset(range(len(self._persons))[index])
+        return self._persons[index]
+
+    def mask(self, all_of=0, none_of=0, any_of=0):
+        """
+        Returns a list of bools, True for persons with all of the all_of
+        flags, none of the none_of flags and, if given, any of the any_of
+        flags.
+        """
+        test = all_of | none_of
+        return [f & test == all_of and (not any_of or f & any_of != 0)
+                for f in self._flags]
+
+    def filter(self, all_of=0, none_of=0, any_of=0):
+        """
+        Returns a PersonCollection of the persons matching the flags, as
+        described in mask.
+        """
+        test = all_of | none_of
+        return self._subset([
+            i for i, f in enumerate(self._flags) if f & test == all_of and (
+                not any_of or f & any_of)])
+
+    def count(self, all_of=0, none_of=0, any_of=0):
+        test = all_of | none_of
+        return sum(1 for f in self._flags if f & test == all_of and (
+            not any_of or f & any_of))
+
+    def _subset(self, indexes):
+        subset = PersonCollection()
+        subset._persons = [self._persons[i] for i in indexes]
+        subset._flags = array("L", [self._flags[i] for i in indexes])
+        return subset
+
+
+class Entity(_FingerprintModel):
     uwregid = models.CharField(max_length=32)
     uwnetid = models.CharField(max_length=128)
     display_name = models.CharField(max_length=250)
@@ -288,6 +626,47 @@ class Entity(models.Model):
             'is_person': self.is_person,
         }
 
+    def to_bytes(self):
+        """
+        Returns the compact binary encoding of this entity.
+        """
+        slots = [getattr(self, name) for name in _ENTITY_TEXT_FIELDS]
+        counts = []
+        for name in _ENTITY_LISTS:
+            values = getattr(self, name, None)
+            counts.append(wire.list_count(values))
+            if values is not None:
+                slots.extend(values)
+
+        bools = 0
+        for i, name in enumerate(_ENTITY_BOOL_FIELDS):
+            bools |= wire.tristate(getattr(self, name)) << (2 * i)
+
+        return wire.pack(wire.ENTITY, _ENTITY_HEADER, [bools] + counts, slots)
+
+    @staticmethod
+    def from_bytes(data):
+        header, offset = wire.unpack_header(data, wire.ENTITY, _ENTITY_HEADER)
+        bools = header[0]
+        counts = header[1:]
+        slots = wire.unpack_slots(data, offset, len(_ENTITY_TEXT_FIELDS) + sum(
+            c for c in counts if c != wire.NO_LIST))
+
+        entity = Entity()
+        i = len(_ENTITY_TEXT_FIELDS)
+        for name, value in zip(_ENTITY_TEXT_FIELDS, slots):
+            setattr(entity, name, value)
+        for shift, name in enumerate(_ENTITY_BOOL_FIELDS):
+            setattr(entity, name, wire.TRISTATE[bools >> (2 * shift) & 3])
+
+        for name, list_count in zip(_ENTITY_LISTS, counts):
+            if list_count == wire.NO_LIST:
+                setattr(entity, name, None)
+            else:
+                setattr(entity, name, slots[i:i + list_count])
+                i += list_count
+        return entity
+
     @staticmethod
     def from_json(data):
         entity = Entity()
@@ -303,3 +682,16 @@ class Entity(models.Model):
             entity.is_person = True
 
         return entity
+
+
+_ENTITY_HEADER = "<B2H"
+_ENTITY_TEXT_FIELDS = ("uwregid", "uwnetid", "display_name")
+_ENTITY_BOOL_FIELDS = ("is_test_entity", "is_person")
+_ENTITY_LISTS = ("prior_uwnetids", "prior_uwregids")
+
+# Fields compared by changed_fields that json_data leaves out
+_DIFF_ATTRS = {
+    "Person": ("prior_uwnetids", "prior_uwregids", "is_student", "is_staff",
+               "is_employee", "is_alum", "is_faculty"),
+    "Entity": _ENTITY_LISTS,
+}
@@ -0,0 +1,51 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Local resizing of ID card photos, using Pillow when it is installed.
+"""
+
+from importlib.util import find_spec
+from io import BytesIO
+
+# Photo heights in pixels, by size name
+PHOTO_HEIGHTS = {"small": 25, "medium": 150, "large": 300}
+
+# The size fetched as the master for smaller sizes
+MASTER_SIZE = "large"
+
+JPEG_QUALITY = 85
+
+
+def can_resize():
+    """
+    Returns True if Pillow is installed.
+    """
+    return find_spec("PIL") is not None
+
+
+def photo_height(size):
+    """
+    Returns the height in pixels of a photo size name or custom height.
+    """
+    return PHOTO_HEIGHTS.get(str(size)) or int(size)
+
+
+def resize_photo(data, height, quality=JPEG_QUALITY):
+    """
+    Returns the jpeg image data scaled to height pixels, keeping its aspect
+    ratio.
+    """
+    from PIL import Image
+
+    image = Image.open(BytesIO(data))
+    width = max(int(round(image.width * height / float(image.height))), 1)
+    # Let the jpeg decoder do most of a large reduction
+    image.draft("RGB", (width, height))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image = image.resize((width, height), Image.LANCZOS)
+
+    out = BytesIO()
+    image.save(out, "JPEG", quality=quality)
+    return out.getvalue()
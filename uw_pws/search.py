@@ -0,0 +1,213 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Helpers for paging through PWS search results.
+"""
+
+from collections import namedtuple
+from contextvars import copy_context
+import string
+import time
+from urllib.parse import parse_qsl, urlencode
+from uw_pws.models import Person
+
+AFFILIATIONS = ("student", "staff", "faculty", "employee", "member", "alum",
+                "affiliate")
+FAN_OUT_WORKERS = 4
+
+# Last name prefixes covering ASCII last names, including those starting
+# with a digit or an apostrophe, as in "'t Hooft".  Last names starting
+# with other characters need prefixes of their own.
+LAST_NAME_PREFIXES = tuple(string.ascii_lowercase + string.digits + "'")
+
+DEFAULT_PAGE_SIZE = 250
+ADAPTIVE = "adaptive"
+
+_page_size_histogram = None
+
+PartitionTiming = namedtuple("PartitionTiming", [
+    "params", "seconds", "pages", "rows"])
+FanOutResult = namedtuple("FanOutResult", ["persons", "timings"])
+
+
+class SearchCursor(object):
+    """
+    The position of a paged search: the href of the next page to request
+    (None once the search is complete), and the pages and rows read so far.
+    Save json_data() to resume the search later with from_json.
+    """
+    def __init__(self, href, pages=0, rows=0):
+        self.href = href
+        self.pages = pages
+        self.rows = rows
+
+    @property
+    def done(self):
+        return not self.href
+
+    def json_data(self):
+        return {
+            'href': self.href,
+            'pages': self.pages,
+            'rows': self.rows,
+        }
+
+    @staticmethod
+    def from_json(data):
+        return SearchCursor(data.get("href"), data.get("pages", 0),
+                            data.get("rows", 0))
+
+    def __eq__(self, other):
+        return self.json_data() == other.json_data()
+
+    def __str__(self):
+        return "href: {}, pages: {}, rows: {}".format(
+            self.href, self.pages, self.rows)
+
+
+class PageSizeTuner(object):
+    """
+    Picks the page size of the next page of an adaptive search from the
+    latency and payload size of the last, aiming for pages that take about
+    target_seconds and are no larger than max_bytes.  Sizes change by at
+    most a factor of two a page, within min_size and max_size.
+    """
+    def __init__(self, target_seconds=1.0, max_bytes=4 * 1024 * 1024,
+                 min_size=10, max_size=500):
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def next_size(self, size, seconds, size_bytes, max_size=None):
+        """
+        Returns the size for the next page, after a page of size rows took
+        seconds and size_bytes.  max_size is the server's MaxResultSize.
+        """
+        scale = self.target_seconds / max(seconds, 0.001)
+        if size_bytes:
+            scale = min(scale, self.max_bytes / size_bytes)
+        scale = min(max(scale, 0.5), 2.0)
+
+        upper = self.max_size
+        if max_size:
+            upper = min(upper, max_size)
+        return int(min(max(size * scale, self.min_size), upper))
+
+
+def observe_page_size(resource, page_size):
+    """
+    Records the page size requested from a search resource, in the
+    restclient_pws_search_page_size histogram.
+    """
+    global _page_size_histogram
+    if _page_size_histogram is None:
+        from prometheus_client import Histogram
+        _page_size_histogram = Histogram(
+            'restclient_pws_search_page_size',
+            'PWS search page size (rows requested)', ['resource'],
+            buckets=[10, 25, 50, 100, 250, 500, 1000])
+    _page_size_histogram.labels(resource).observe(page_size)
+
+
+def page_size_of(href):
+    """
+    Returns the page_size requested by a search href, or None.
+    """
+    for key, value in parse_qsl(href.partition("?")[2]):
+        if key == "page_size":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+
+
+def with_page_size(href, page_size):
+    """
+    Returns the search href, requesting page_size rows instead.
+    """
+    path, _, query = href.partition("?")
+    params = [(key, value) for key, value in parse_qsl(
+        query, keep_blank_values=True) if key != "page_size"]
+    params.append(("page_size", page_size))
+    return "{}?{}".format(path, urlencode(params))
+
+
+def search_key(resource, params, host=None, actas=None):
+    """
+    Returns a key for the results of a search of resource with params,
+    sent to host acting as actas, the same whatever the order of the
+    params.  The page size doesn't change the results, so isn't part of it.
+    """
+    return (host, actas, "{}?{}".format(resource, urlencode(sorted(
+        (key, str(value).lower() if isinstance(value, bool) else str(value))
+        for key, value in params.items() if key != "page_size"))))
+
+
+def parse_person_page(rows, as_bytes=False):
+    """
+    Returns the Persons rows of a decoded search page as Person objects or,
+    for handing back from another process, their to_bytes encodings.
+    """
+    persons = [Person.from_json(person_data) for person_data in rows]
+    if as_bytes:
+        return [person.to_bytes() for person in persons]
+    return persons
+
+
+def affiliation_partitions(affiliations=AFFILIATIONS, **kwargs):
+    """
+    Returns person_search params splitting a query by affiliation.  Persons
+    with none of the affiliations are not found.
+    """
+    return [dict(kwargs, **{"edupersonaffiliation_" + affiliation: True})
+            for affiliation in affiliations]
+
+
+def last_name_partitions(prefixes, **kwargs):
+    """
+    Returns person_search params splitting a query by last name prefix.
+    Only persons whose last names start with one of prefixes are found, so
+    prefixes must cover every last name expected, e.g.
+    LAST_NAME_PREFIXES + ("ø",) to find "Ørsted" as well.
+    """
+    return [dict(kwargs, last_name=prefix + "*") for prefix in prefixes]
+
+
+def fan_out_person_search(pws, partitions, max_workers=FAN_OUT_WORKERS):
+    """
+    Runs a person_search for each of the partitions' params concurrently,
+    and returns a FanOutResult of the persons found, in partition order and
+    without repeated uwregids, and a PartitionTiming for each partition.
+    The partitions share any deadline the caller is under, and if one
+    fails, those not yet started are cancelled.
+    """
+    def search(params):
+        start = time.perf_counter()
+        persons = []
+        pages = 0
+        for page, cursor in pws.person_search_pages(**params):
+            persons.extend(page)
+            pages = cursor.pages
+        return persons, PartitionTiming(
+            params, time.perf_counter() - start, pages, len(persons))
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(copy_context().run, search, params)
+                   for params in partitions]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    seen = set()
+    persons = []
+    for partition_persons, timing in results:
+        for person in partition_persons:
+            if person.uwregid not in seen:
+                seen.add(person.uwregid)
+                persons.append(person)
+    return FanOutResult(persons, [timing for persons, timing in results])
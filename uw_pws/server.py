@@ -0,0 +1,242 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+A local stand-in for PWS, for load testing clients without production PWS.
+
+Serves the mock resources, plus any number of synthetic persons (user1,
+user2, ...) with paged person searches over them, with added latency and
+errors.  Searches are filtered on uwnetid, uwregid, first_name, last_name
+and edupersonaffiliation_* params, with * wildcards, and other params are
+ignored.  Synthetic persons have a first name of "User" and a last name
+of their number, so first_name=user searches are persons / page_size
+pages deep:
+
+    python -m uw_pws.server --port 8000 --persons 100000 --latency 0.05
+"""
+
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+import argparse
+import gzip
+import json
+import random
+import re
+import time
+from uw_pws.dao import RESOURCE_PATH
+from uw_pws.mock import (
+    MAX_RESULT_SIZE, FixtureStore, search_page_data, synthetic_entity_data,
+    synthetic_person_data)
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".jpg": "image/jpeg",
+}
+
+_RE_PERSON = re.compile(r"^/identity/v2/person/([^/]+)/full\.json$")
+_RE_ENTITY = re.compile(r"^/identity/v2/entity/([^/]+)\.json$")
+_RE_PHOTO = re.compile(r"^/idcard/v1/photo/([0-9A-F]{32})-[^/]+\.jpg$")
+_RE_NETID = re.compile(r"^user([0-9]+)$")
+_RE_REGID = re.compile(r"^[0-9A-Fa-f]{32}$")
+_PHOTO = "/idcard/v1/photo/9136CCB8F66711D5BE060004AC494FFE-medium.jpg"
+
+# Smallest JSON body sent gzipped to clients that accept it
+GZIP_MIN_SIZE = 1024
+
+# Person search params matched against each synthetic person's values
+_SEARCH_VALUES = {
+    "uwnetid": lambda index: "user{}".format(index),
+    "uwregid": lambda index: "{:032X}".format(index),
+    "first_name": lambda index: "User",
+    "last_name": lambda index: str(index),
+}
+_AFFILIATION_PARAM = "edupersonaffiliation_"
+
+
+class StandIn(object):
+    """
+    Answers PWS requests.  Each request waits latency seconds plus up to
+    jitter more, then fails with error_status at error_rate.  persons
+    synthetic persons are served after the mock resources, and person
+    searches the mock resources don't cover page through all of them.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, persons=0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.persons = persons
+        self._random = random.Random(seed)
+        self._store = FixtureStore()
+
+    def respond(self, url):
+        """
+        Returns the status, content type and body for url.
+        """
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status, CONTENT_TYPES[".json"], json.dumps(
+                {"StatusCode": self.error_status,
+                 "Message": "Stand-in error"}).encode("utf-8")
+
+        fixture = self._store.get(url, [RESOURCE_PATH])
+        if fixture is not None:
+            status, data, headers = fixture
+            return status, self._content_type(url), data or b""
+
+        data = self._synthetic(url)
+        if data is not None:
+            if isinstance(data, bytes):
+                return 200, CONTENT_TYPES[".jpg"], data
+            return 200, CONTENT_TYPES[".json"], json.dumps(data).encode(
+                "utf-8")
+
+        return 404, CONTENT_TYPES[".json"], json.dumps(
+            {"StatusCode": 404, "Message": "Not found"}).encode("utf-8")
+
+    def _synthetic(self, url):
+        path, _, query = url.partition("?")
+        if path == "/identity/v2/person.json":
+            return self._person_page(path, query)
+
+        match = _RE_PERSON.match(path)
+        if match and self._index(match.group(1)):
+            return synthetic_person_data(self._index(match.group(1)))
+
+        match = _RE_ENTITY.match(path)
+        if match and self._index(match.group(1)):
+            return synthetic_entity_data(self._index(match.group(1)))
+
+        match = _RE_PHOTO.match(path)
+        if match and self._index(match.group(1)):
+            return self._store.get(_PHOTO, [RESOURCE_PATH])[1]
+
+    def _person_page(self, path, query):
+        params = [(key, value) for key, value in parse_qsl(
+            query, keep_blank_values=True) if key != "page_start"]
+        page_start = max(int(dict(parse_qsl(query)).get("page_start", 1)), 1)
+        page_size = min(int(dict(params).get("page_size", 10)),
+                        MAX_RESULT_SIZE)
+        indexes = _matching_indexes(self.persons, tuple(sorted(
+            (key, value) for key, value in params if (
+                key in _SEARCH_VALUES or key.startswith(
+                    _AFFILIATION_PARAM)))))
+        return search_page_data(
+            "Persons", [synthetic_person_data(i) for i in indexes[
+                page_start - 1:page_start - 1 + page_size]],
+            "{}?{}".format(path, urlencode(params)), page_start, page_size,
+            len(indexes))
+
+    def _index(self, key):
+        """
+        Returns the number of the synthetic person with uwnetid or uwregid
+        key, or None.
+        """
+        match = _RE_NETID.match(key)
+        index = int(match.group(1)) if match else (
+            int(key, 16) if _RE_REGID.match(key) else None)
+        if index is not None and 0 < index <= self.persons:
+            return index
+
+    def _content_type(self, url):
+        for suffix, content_type in CONTENT_TYPES.items():
+            if suffix in url:
+                return content_type
+        return "application/octet-stream"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, content_type, body = self.server.stand_in.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if (content_type == CONTENT_TYPES[".json"] and
+                len(body) >= GZIP_MIN_SIZE and
+                "gzip" in self.headers.get("Accept-Encoding", "")):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        try:
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@lru_cache(maxsize=64)
+def _matching_indexes(persons, filters):
+    """
+    Returns the numbers of the synthetic persons matching the search
+    params in filters.
+    """
+    tests = []
+    for key, value in filters:
+        if key.startswith(_AFFILIATION_PARAM):
+            # Synthetic persons are only members
+            member = key[len(_AFFILIATION_PARAM):] == "member"
+            if member != (value.lower() == "true"):
+                return range(0)
+        else:
+            pattern = re.compile(
+                re.escape(value).replace(r"\*", ".*") + "$", re.I)
+            tests.append((pattern.match, _SEARCH_VALUES[key]))
+
+    if not tests:
+        return range(1, persons + 1)
+    return [index for index in range(1, persons + 1) if all(
+        match(value(index)) for match, value in tests)]
+
+
+def make_server(host="127.0.0.1", port=0, **kwargs):
+    """
+    Returns an HTTP server for a StandIn made with kwargs.  Port 0 picks a
+    free port, found in server.server_address.
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.stand_in = StandIn(**kwargs)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--persons", type=int, default=0,
+                        help="number of synthetic persons")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, latency=args.latency,
+                         jitter=args.jitter, error_rate=args.error_rate,
+                         error_status=args.error_status,
+                         persons=args.persons)
+    print("Serving PWS on http://{}:{}".format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Read-only person snapshots, shared by the processes of a server through the
+page cache.  A snapshot is built from person search results:
+
+    write_person_snapshot(pws, "/var/cache/pws/faculty.snapshot",
+                          edupersonaffiliation_faculty=True)
+
+and opened with mmap in each process:
+
+    snapshot = PersonSnapshot("/var/cache/pws/faculty.snapshot")
+    person = snapshot.get_person_by_netid("javerage")
+
+The file holds a header, the persons' to_bytes records sorted by uwregid,
+an index of fixed size entries on uwregid, and one on uwnetid:
+
+    header:       magic, the number of persons and of netids, the netid
+                  width, and the offsets of the records, the regid index
+                  and the netid index
+    regid index:  uwregid (32 bytes), record offset, record length
+    netid index:  uwnetid (netid width bytes, NUL padded), regid entry
+
+Lookups binary search an index, and only the record found is decoded.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from uw_pws.models import Person
+
+MAGIC = b"PWSSNAP1"
+
+# Snapshots are read by the processes of a server, which may not run as
+# the user writing them
+SNAPSHOT_MODE = 0o644
+
+_HEADER = struct.Struct("<8sIIIQQQ")
+_REGID_ENTRY = struct.Struct("<32sQI")
+_NETID_ENTRY = "<{}sI"
+
+
+class PersonSnapshot(object):
+    """
+    A person snapshot file, opened read-only with mmap.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise ValueError("{} is not a person snapshot".format(path))
+        (magic, self._count, self._netid_count, netid_width, records,
+         self._regid_index, self._netid_index) = _HEADER.unpack_from(
+            self._mmap)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("{} is not a person snapshot".format(path))
+        self._netid_entry = struct.Struct(_NETID_ENTRY.format(netid_width))
+
+    def get_person_by_regid(self, regid):
+        """
+        Returns the Person with the uwregid, or None if it isn't in the
+        snapshot.
+        """
+        index = self._find_regid(regid)
+        if index is not None:
+            return self._person(index)
+
+    def get_person_by_netid(self, netid):
+        """
+        Returns the Person with the uwnetid, or None if it isn't in the
+        snapshot.
+        """
+        index = self._find_netid(netid)
+        if index is not None:
+            return self._person(index)
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        # A 32 character key can be a uwnetid as well as a uwregid
+        return (self._find_regid(key) is not None or
+                self._find_netid(key) is not None)
+
+    def __iter__(self):
+        """
+        Yields the persons in uwregid order, decoding each as it's reached.
+        """
+        for index in range(self._count):
+            yield self._person(index)
+
+    def _person(self, index):
+        regid, offset, length = _REGID_ENTRY.unpack_from(
+            self._mmap, self._regid_index + index * _REGID_ENTRY.size)
+        return Person.from_bytes(self._mmap[offset:offset + length])
+
+    def _find_regid(self, regid):
+        key = _key(regid, upper=True)
+        if key is None or len(key) != 32:
+            return None
+        return self._search(key, self._count, self._regid_index,
+                            _REGID_ENTRY.size, 32, lambda index: index)
+
+    def _find_netid(self, netid):
+        entry = self._netid_entry
+        key = _key(netid)
+        if key is None or len(key) > entry.size - 4:
+            return None
+        key = key.ljust(entry.size - 4, b"\x00")
+        return self._search(
+            key, self._netid_count, self._netid_index, entry.size, len(key),
+            lambda index: entry.unpack_from(
+                self._mmap, self._netid_index + index * entry.size)[1])
+
+    def _search(self, key, count, start, size, width, result):
+        """
+        Returns result(i) for the entry i of the count size byte entries at
+        start whose first width bytes are key, or None.
+        """
+        data = self._mmap
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            offset = start + middle * size
+            value = data[offset:offset + width]
+            if value < key:
+                low = middle + 1
+            elif value > key:
+                high = middle
+            else:
+                return result(middle)
+
+
+def write_snapshot(persons, path, mode=SNAPSHOT_MODE):
+    """
+    Writes a snapshot of persons to path, with the permissions mode,
+    replacing any snapshot there in one step so that processes opening it
+    never see a partial file.  Persons without a valid uwregid are left
+    out, and of persons with the same uwregid, the last is kept.
+    """
+    records = {}
+    for person in persons:
+        regid = _key(person.uwregid, upper=True)
+        if regid is not None and len(regid) == 32:
+            records[regid] = (_key(person.uwnetid), person.to_bytes())
+
+    regids = sorted(records)
+    netids = sorted((records[regid][0], index) for (
+        index, regid) in enumerate(regids) if records[regid][0])
+    netid_width = max([len(netid) for netid, index in netids] + [1])
+    netid_entry = struct.Struct(_NETID_ENTRY.format(netid_width))
+
+    records_offset = _HEADER.size
+    regid_index = records_offset + sum(
+        len(record) for netid, record in records.values())
+    netid_index = regid_index + len(regids) * _REGID_ENTRY.size
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as snapshot:
+            snapshot.write(_HEADER.pack(
+                MAGIC, len(regids), len(netids), netid_width, records_offset,
+                regid_index, netid_index))
+            for regid in regids:
+                snapshot.write(records[regid][1])
+
+            offset = records_offset
+            for regid in regids:
+                length = len(records[regid][1])
+                snapshot.write(_REGID_ENTRY.pack(regid, offset, length))
+                offset += length
+
+            for netid, index in netids:
+                snapshot.write(netid_entry.pack(netid, index))
+
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temp_path, mode)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(regids)
+
+
+def write_person_snapshot(pws, path, mode=SNAPSHOT_MODE, **kwargs):
+    """
+    Writes a snapshot of the persons found by pws.person_search(**kwargs)
+    to path, with the permissions mode, and returns the number of persons
+    in it.
+    """
+    def persons():
+        for page, cursor in pws.person_search_pages(**kwargs):
+            yield from page
+
+    return write_snapshot(persons(), path, mode)
+
+
+def _key(value, upper=False):
+    if value is None:
+        return None
+    value = str(value)
+    value = value.upper() if upper else value.lower()
+    try:
+        return value.encode("ascii")
+    except UnicodeEncodeError:
+        return None
@@ -0,0 +1,164 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from uw_pws import PWS
+from uw_pws.cache import (
+    TTLCache, StaleWhileRevalidateCache, get_cache, clear_caches)
+from uw_pws.dao import PWS_DAO
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(TestCase):
+
+    def test_expiry(self):
+        clock = FakeClock()
+        cache = TTLCache(10, clock=clock)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertTrue("a" in cache)
+
+        clock.now += 10
+        self.assertIsNone(cache.get("a"))
+        self.assertFalse("a" in cache)
+
+        cache.set("b", 2, ttl=30)
+        clock.now += 20
+        self.assertEqual(cache.get("b"), 2)
+        cache.delete("b")
+        self.assertIsNone(cache.get("b"))
+
+    def test_max_size(self):
+        cache = TTLCache(10, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+
+class TestStaleWhileRevalidateCache(TestCase):
+
+    def test_soft_and_hard_ttl(self):
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache(10, 60, clock=clock)
+        values = iter(["v1", "v2", "v3"])
+
+        def loader():
+            return next(values)
+
+        self.assertEqual(cache.get("k", loader), "v1")
+        self.assertEqual(cache.get("k", loader), "v1")
+
+        # stale, refreshed in the background
+        clock.now += 20
+        self.assertEqual(cache.get("k", loader), "v1")
+        cache.wait_for_refreshes(timeout=5)
+        self.assertEqual(cache.get("k", loader), "v2")
+
+        # expired, loaded synchronously
+        clock.now += 60
+        self.assertEqual(cache.get("k", loader), "v3")
+
+    def test_refresh_dedup(self):
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache(10, 60, clock=clock)
+        cache.get("k", lambda: "v1")
+        clock.now += 20
+
+        calls = []
+
+        class Executor(object):
+            def submit(self, fn, *args):
+                calls.append(args)
+
+        cache._executor = Executor()
+        cache.get("k", lambda: "v2")
+        cache.get("k", lambda: "v2")
+        self.assertEqual(len(calls), 1)
+
+    def test_refresh_failure(self):
+        clock = FakeClock()
+        cache = StaleWhileRevalidateCache(10, 60, clock=clock)
+        cache.get("k", lambda: "v1")
+        clock.now += 20
+
+        def loader():
+            raise DataFailureException("/", 500, "")
+
+        self.assertEqual(cache.get("k", loader), "v1")
+        cache.wait_for_refreshes(timeout=5)
+        self.assertEqual(len(cache._pending), 0)
+        self.assertEqual(cache.get("k", lambda: "v2"), "v1")
+
+    def test_bad_ttls(self):
+        self.assertRaises(ValueError, StaleWhileRevalidateCache, 60, 10)
+
+    def test_registry(self):
+        cache = get_cache("test", TTLCache, 10)
+        self.assertIs(get_cache("test", TTLCache, 10), cache)
+        self.assertIsNot(get_cache("test", TTLCache, 20), cache)
+
+
+@override_settings(
+    RESTCLIENTS_PWS_DAO_CLASS='Mock',
+    RESTCLIENTS_PWS_STALE_WHILE_REVALIDATE={
+        "get_person_by_netid": {"soft_ttl": 0, "hard_ttl": 60},
+        "get_entity_by_regid": {"soft_ttl": 60, "hard_ttl": 60},
+        "get_idcard_photo": {"soft_ttl": 60, "hard_ttl": 60}})
+class PWSTestStaleWhileRevalidate(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_person_by_netid(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            person = pws.get_person_by_netid("javerage")
+            self.assertEqual(m.call_count, 1)
+
+            person.display_name = "Changed"
+            person = pws.get_person_by_netid("JAVERAGE")
+            self.assertEqual(person.display_name, "Jamesy McJamesy")
+
+            pws._get_swr_cache("get_person_by_netid").wait_for_refreshes(5)
+            self.assertEqual(m.call_count, 2)
+
+        # not configured
+        self.assertIsNone(pws._get_swr_cache("get_person_by_regid"))
+
+    def test_entity_by_regid(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            pws.get_entity_by_regid("605764A811A847E690F107D763A4B32A")
+            entity = pws.get_entity_by_regid(
+                "605764a811a847e690f107d763a4b32a")
+            self.assertEqual(entity.uwnetid, "somalt")
+            self.assertEqual(m.call_count, 1)
+
+    def test_idcard_photo(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            regid = "9136CCB8F66711D5BE060004AC494FFE"
+            img1 = pws.get_idcard_photo(regid)
+            img2 = pws.get_idcard_photo(regid)
+            self.assertEqual(img1.read(), img2.read())
+            self.assertEqual(m.call_count, 1)
+
+            PWS(actas="bill").get_idcard_photo(regid)
+            self.assertEqual(m.call_count, 2)
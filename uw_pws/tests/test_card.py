@@ -2,8 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
 from uw_pws import PWS
 from restclients_core.exceptions import DataFailureException
+from uw_pws.cache import clear_caches
+from uw_pws.dao import PWS_DAO
 from uw_pws.exceptions import InvalidProxRFID
 from uw_pws.util import fdao_pws_override
 
@@ -40,3 +44,60 @@ class IdCardTestCard(TestCase):
                           pws.get_person_by_prox_rfid, "1")
         self.assertRaises(InvalidProxRFID,
                           pws.get_person_by_prox_rfid, "1234567890")
+
+    def test_by_rfids(self):
+        pws = PWS()
+        persons = pws.get_persons_by_prox_rfids(
+            ['1223221621633408', '1234567890123456'])
+        self.assertEqual(persons['1223221621633408'].uwnetid, 'javerage')
+        self.assertIsNone(persons['1234567890123456'])
+
+        persons = pws.get_persons_by_prox_rfids(
+            rfid for rfid in ['1223221621633408', '1234567890123456'])
+        self.assertEqual(persons['1223221621633408'].uwnetid, 'javerage')
+        self.assertIn('1234567890123456', persons)
+
+        self.assertRaises(InvalidProxRFID,
+                          pws.get_persons_by_prox_rfids,
+                          ['1223221621633408', '123456'])
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_PROX_RFID_CACHE_TTL=60,
+                   RESTCLIENTS_PWS_PROX_RFID_NEGATIVE_CACHE_TTL=60)
+class IdCardTestCardCache(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_rfid_cache(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            pws.get_person_by_prox_rfid('1223221621633408')
+            self.assertEqual(m.call_count, 2)
+            person = pws.get_person_by_prox_rfid('1223221621633408')
+            self.assertEqual(person.uwnetid, 'javerage')
+            self.assertEqual(m.call_count, 3)
+
+    def test_negative_cache(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            for i in range(2):
+                self.assertRaises(DataFailureException,
+                                  pws.get_person_by_prox_rfid,
+                                  '1234567890123456')
+            self.assertEqual(m.call_count, 1)
+
+    def test_by_rfids(self):
+        pws = PWS()
+        pws.get_person_by_prox_rfid('1223221621633408')
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            persons = pws.get_persons_by_prox_rfids(
+                ['1223221621633408', '1234567890123456'])
+            self.assertEqual(persons['1223221621633408'].uwnetid,
+                             'javerage')
+            self.assertIsNone(persons['1234567890123456'])
+            self.assertEqual(m.call_count, 2)
@@ -0,0 +1,200 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+from unittest import TestCase
+from unittest.mock import patch
+import ssl
+import time
+from commonconf import override_settings
+from restclients_core.dao import LiveDAO
+from restclients_core.exceptions import DataFailureException
+from uw_pws import PWS
+from uw_pws.dao import PWS_DAO
+from uw_pws.deadline import deadline, remaining
+from uw_pws.exceptions import DeadlineExceeded
+from uw_pws.search import fan_out_person_search
+from uw_pws.server import make_server
+from uw_pws.util import fdao_pws_override
+
+
+def slow(pws, seconds):
+    get_url = pws.dao.getURL
+
+    def slow_get_url(url, headers):
+        time.sleep(seconds)
+        return get_url(url, headers)
+    return patch.object(PWS_DAO, "getURL", side_effect=slow_get_url)
+
+
+class PWSTestDeadlineContext(TestCase):
+
+    def test_remaining(self):
+        self.assertIsNone(remaining())
+        with deadline(None):
+            self.assertIsNone(remaining())
+        with deadline(10):
+            self.assertTrue(9 < remaining() <= 10)
+            with deadline(1):
+                self.assertTrue(0 < remaining() <= 1)
+            with deadline(100):
+                self.assertTrue(remaining() <= 10)
+            self.assertTrue(remaining() > 9)
+        self.assertIsNone(remaining())
+
+    def test_exception(self):
+        ex = DeadlineExceeded("/identity/v2/person.json")
+        self.assertNotIsInstance(ex, DataFailureException)
+        self.assertEqual(ex.url, "/identity/v2/person.json")
+        self.assertIn(ex.url, str(ex))
+
+
+@fdao_pws_override
+class PWSTestDeadline(TestCase):
+
+    def test_prox_rfid(self):
+        pws = PWS()
+        with slow(pws, 0.05) as get:
+            self.assertRaises(DeadlineExceeded, pws.get_person_by_prox_rfid,
+                              "1223221621633408", timeout=0.02)
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(pws.get_person_by_prox_rfid(
+                "1223221621633408", timeout=5).uwnetid, "javerage")
+
+    def test_person_search(self):
+        pws = PWS()
+        with slow(pws, 0.05) as get:
+            self.assertRaises(DeadlineExceeded, pws.person_search,
+                              changed_since_date=2019, timeout=0.02)
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(len(pws.person_search(
+                changed_since_date=2019, timeout=5)), 2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pws = PWS(parse_executor=executor)
+            with slow(pws, 0.05):
+                self.assertRaises(DeadlineExceeded, pws.person_search,
+                                  changed_since_date=2019, timeout=0.02)
+
+    def test_parse_cancelled(self):
+        futures = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Keeps the parse of the first page waiting
+            blocked = Event()
+            executor.submit(blocked.wait, 1)
+            submit = executor.submit
+
+            def submitted(*args):
+                futures.append(submit(*args))
+                return futures[-1]
+
+            pws = PWS(parse_executor=executor)
+            get_url = pws.dao.getURL
+
+            def slow_first(url, headers):
+                if "page_start" not in url:
+                    time.sleep(0.05)
+                return get_url(url, headers)
+
+            with patch.object(executor, "submit", side_effect=submitted), \
+                    patch.object(PWS_DAO, "getURL", side_effect=slow_first):
+                self.assertRaises(DeadlineExceeded, pws.person_search,
+                                  changed_since_date=2019, timeout=0.02)
+            blocked.set()
+        self.assertEqual(len(futures), 1)
+        self.assertTrue(futures[0].cancelled())
+
+    def test_entity_search(self):
+        pws = PWS()
+        with slow(pws, 0.05) as get:
+            self.assertRaises(DeadlineExceeded, pws.entity_search,
+                              is_test_entity=True, timeout=0.02)
+            self.assertEqual(get.call_count, 1)
+
+    def test_context(self):
+        pws = PWS()
+        with slow(pws, 0.05) as get:
+            with deadline(0.02):
+                pws.get_person_by_netid("javerage")
+                self.assertRaises(DeadlineExceeded,
+                                  pws.get_entity_by_netid, "somalt")
+                self.assertRaises(DeadlineExceeded, fan_out_person_search,
+                                  pws, [{"changed_since_date": 2019}])
+            self.assertEqual(get.call_count, 1)
+
+    def test_not_retried(self):
+        pws = PWS()
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                               RESTCLIENTS_PWS_SEARCH_PAGE_TRIES=3,
+                               RESTCLIENTS_PWS_SEARCH_PAGE_RETRY_DELAY=0.5):
+            with slow(pws, 0.05) as get:
+                start = time.monotonic()
+                self.assertRaises(DeadlineExceeded, pws.person_search,
+                                  changed_since_date=2019, timeout=0.02)
+                self.assertLess(time.monotonic() - start, 0.4)
+                self.assertEqual(get.call_count, 1)
+
+    def test_retry_delay(self):
+        pws = PWS()
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                               RESTCLIENTS_PWS_SEARCH_PAGE_TRIES=3,
+                               RESTCLIENTS_PWS_SEARCH_PAGE_RETRY_DELAY=0.5):
+            with patch.object(PWS_DAO, "getURL") as get:
+                get.side_effect = DataFailureException("/", 503, "Down")
+                start = time.monotonic()
+                self.assertRaises(DeadlineExceeded, pws.person_search,
+                                  changed_since_date=2019, timeout=0.2)
+                self.assertLess(time.monotonic() - start, 0.1)
+                self.assertEqual(get.call_count, 1)
+
+                self.assertRaises(DataFailureException, pws.person_search,
+                                  changed_since_date=2019, timeout=5)
+                self.assertEqual(get.call_count, 4)
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Live',
+                   RESTCLIENTS_PWS_HOST='http://127.0.0.1:0')
+class PWSTestLiveDeadline(TestCase):
+
+    def setUp(self):
+        self.server = make_server(latency=0.5)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        LiveDAO.pools.pop("pws", None)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        LiveDAO.pools.pop("pws", None)
+
+    def test_read_timeout(self):
+        host = "http://{}:{}".format(*self.server.server_address)
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Live',
+                               RESTCLIENTS_PWS_HOST=host):
+            pws = PWS()
+            start = time.monotonic()
+            with deadline(0.1):
+                self.assertRaises(DeadlineExceeded, pws.get_person_by_netid,
+                                  "javerage")
+            self.assertLess(time.monotonic() - start, 0.4)
+            self.assertEqual(pws.get_person_by_netid("javerage").uwnetid,
+                             "javerage")
+
+    def test_pool_timeout(self):
+        dao = PWS().dao.get_implementation()
+        pool = dao.get_pool()
+        with deadline(0.2):
+            timeout = dao.get_pool().timeout
+        self.assertLessEqual(timeout.read_timeout, 0.2)
+        self.assertLessEqual(timeout.connect_timeout, 0.2)
+        self.assertEqual(pool.timeout.read_timeout, dao._get_timeout())
+
+    def test_ssl_error(self):
+        pws = PWS()
+        pool = pws.dao.get_implementation().get_pool()
+        with patch.object(pool, "urlopen", side_effect=ssl.SSLError()), \
+                patch.object(LiveDAO, "_prometheus_ssl_error") as metric:
+            with deadline(5):
+                self.assertRaises(ssl.SSLError, pws.get_person_by_netid,
+                                  "javerage")
+            self.assertEqual(metric.call_count, 1)
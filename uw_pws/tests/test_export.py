@@ -0,0 +1,97 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from io import StringIO
+from unittest import TestCase, skipUnless
+import csv
+import os
+import tempfile
+from uw_pws import PWS
+from uw_pws.export import (
+    PERSON_COLUMN_NAMES, iter_person_batches, person_row,
+    person_search_columns, write_person_csv, write_person_parquet)
+from uw_pws.models import Person, Position
+from uw_pws.util import fdao_pws_override
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+@fdao_pws_override
+class PWSTestExport(TestCase):
+
+    def test_columns(self):
+        table = person_search_columns(PWS(), changed_since_date=2019)
+        self.assertEqual(list(table.keys()), list(PERSON_COLUMN_NAMES))
+        self.assertEqual(table["uwnetid"], ["javerage", "phil"])
+
+        persons = PWS().person_search(changed_since_date=2019)
+        for i, person in enumerate(persons):
+            data = person.json_data()
+            for name in ("uwregid", "display_name", "employee_id",
+                         "student_number", "employee_state",
+                         "whitepages_publish", "publish_in_emp_directory"):
+                self.assertEqual(table[name][i], data[name], name)
+            self.assertEqual(table["student_departments"][i],
+                             "|".join(person.student_departments))
+            self.assertEqual(
+                table["positions_title"][i],
+                "|".join(p.title for p in person.positions))
+
+    def test_person_row(self):
+        person = Person(uwnetid="javerage", is_test_entity=True)
+        person.phones = ["206 555-1212", "206 555-1213"]
+        person.addresses = None
+        person.positions = [
+            Position(department="Computing", title="Analyst",
+                     is_primary=True),
+            Position(department="Medicine", is_primary=False)]
+        row = dict(zip(PERSON_COLUMN_NAMES, person_row(person)))
+        self.assertEqual(row["uwnetid"], "javerage")
+        self.assertIs(row["is_test_entity"], True)
+        self.assertEqual(row["phones"], "206 555-1212|206 555-1213")
+        self.assertIsNone(row["addresses"])
+        self.assertEqual(row["faxes"], "")
+        self.assertEqual(row["positions_department"], "Computing|Medicine")
+        self.assertEqual(row["positions_title"], "Analyst|")
+        self.assertEqual(row["positions_is_primary"], "true|false")
+
+    def test_column_subset(self):
+        table = person_search_columns(
+            PWS(), columns=["uwregid", "positions_is_primary"],
+            separator=";", changed_since_date=2019)
+        self.assertEqual(list(table.keys()),
+                         ["uwregid", "positions_is_primary"])
+        self.assertRaises(ValueError, person_search_columns, PWS(),
+                          columns=["positions"], changed_since_date=2019)
+
+    def test_batches(self):
+        batches = list(iter_person_batches(
+            PWS(), columns=["uwnetid"], changed_since_date=2019))
+        self.assertEqual(batches, [{"uwnetid": ["javerage"]},
+                                   {"uwnetid": ["phil"]}])
+
+    def test_csv(self):
+        out = StringIO()
+        count = write_person_csv(PWS(), out, columns=["uwnetid", "surname"],
+                                 changed_since_date=2019)
+        self.assertEqual(count, 2)
+        rows = list(csv.reader(StringIO(out.getvalue())))
+        self.assertEqual(rows[0], ["uwnetid", "surname"])
+        self.assertEqual(rows[1][0], "javerage")
+        self.assertEqual(len(rows), 3)
+
+    @skipUnless(pq is not None, "pyarrow is not installed")
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, "persons.parquet")
+            count = write_person_parquet(PWS(), filename,
+                                         changed_since_date=2019)
+            self.assertEqual(count, 2)
+            parquet = pq.ParquetFile(filename)
+            self.assertEqual(parquet.num_row_groups, 2)
+            table = parquet.read()
+            self.assertEqual(table.column("uwnetid").to_pylist(),
+                             ["javerage", "phil"])
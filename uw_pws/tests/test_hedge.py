@@ -0,0 +1,243 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from threading import current_thread
+from unittest import TestCase
+from unittest.mock import patch
+import time
+from commonconf import override_settings
+from prometheus_client import REGISTRY
+from restclients_core.exceptions import DataFailureException
+from uw_pws import PWS
+from uw_pws.cache import clear_caches
+from uw_pws.dao import PWS_DAO
+from uw_pws.deadline import deadline
+from uw_pws.exceptions import DeadlineExceeded
+from uw_pws.hedge import Hedger
+
+
+def hedges(method, event):
+    return REGISTRY.get_sample_value(
+        "restclient_pws_hedges_total",
+        {"method": method, "event": event}) or 0
+
+
+def primed(hedger, samples=20):
+    for i in range(samples):
+        hedger.call(lambda: None, "test", "/test")
+    return hedger
+
+
+class PWSTestHedger(TestCase):
+
+    def test_delay(self):
+        hedger = Hedger(percentile=50, min_delay=0.001, min_samples=4)
+        self.assertIsNone(hedger.delay())
+        for seconds in (0.01, 0.02, 0.03, 0.04):
+            hedger.call(lambda: time.sleep(seconds), "test", "/test")
+        self.assertTrue(0.02 <= hedger.delay() < 0.03)
+
+        hedger = Hedger(min_delay=0.05, min_samples=1)
+        primed(hedger, 1)
+        self.assertEqual(hedger.delay(), 0.05)
+
+        hedger.clear()
+        self.assertIsNone(hedger.delay())
+
+    def test_delay_refresh(self):
+        now = [0.0]
+
+        def takes(seconds):
+            def fn():
+                now[0] += seconds
+            return fn
+
+        hedger = Hedger(percentile=50, min_delay=0, min_samples=1,
+                        refresh=3, clock=lambda: now[0])
+        hedger.call(takes(1.0), "test", "/test")
+        self.assertEqual(hedger.delay(), 1.0)
+        hedger.call(takes(3.0), "test", "/test")
+        hedger.call(takes(3.0), "test", "/test")
+        self.assertEqual(hedger.delay(), 1.0)
+        hedger.call(takes(3.0), "test", "/test")
+        self.assertEqual(hedger.delay(), 3.0)
+
+    def test_hedge_won(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        threads = []
+
+        def fn():
+            threads.append(current_thread())
+            if len(threads) == 1:
+                time.sleep(0.1)
+                raise DataFailureException("/test", 503, "slow")
+            return "backup"
+
+        fired = hedges("test_won", "fired")
+        won = hedges("test_won", "won")
+        self.assertEqual(hedger.call(fn, "test_won", "/test"), "backup")
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(current_thread(), threads)
+        self.assertEqual(hedges("test_won", "fired"), fired + 1)
+        self.assertEqual(hedges("test_won", "won"), won + 1)
+
+    def test_slow_success(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "first"
+            return "backup"
+
+        won = hedges("test_slow", "won")
+        start = time.monotonic()
+        self.assertEqual(hedger.call(fn, "test_slow", "/test"), "backup")
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(hedges("test_slow", "won"), won + 1)
+
+    def test_first_answers(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                return "first"
+            time.sleep(0.5)
+            return "backup"
+
+        won = hedges("test_first", "won")
+        self.assertEqual(hedger.call(fn, "test_first", "/test"), "first")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(hedges("test_first", "won"), won)
+
+    def test_fast_call_not_hedged(self):
+        hedger = primed(Hedger(max_rate=1.0, min_delay=0.5))
+        calls = []
+        self.assertEqual(hedger.call(
+            lambda: calls.append(1) or "ok", "test_fast", "/test"), "ok")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(hedges("test_fast", "fired"), 0)
+
+    def test_rate_cap(self):
+        hedger = primed(Hedger(max_rate=0.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.05)
+
+        hedger.call(fn, "test_cap", "/test")
+        self.assertEqual(len(calls), 1)
+
+        hedger = primed(Hedger(max_rate=0.1, min_samples=10), 10)
+        for i in range(4):
+            hedger.call(fn, "test_cap", "/test")
+        self.assertEqual(hedges("test_cap", "fired"), 1)
+
+    def test_both_fail(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise DataFailureException("/test", 500, "first")
+            raise DataFailureException("/test", 503, "second")
+
+        with self.assertRaises(DataFailureException) as cm:
+            hedger.call(fn, "test_fail", "/test")
+        self.assertEqual(cm.exception.status, 500)
+
+    def test_failure_waits_for_other(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise DataFailureException("/test", 500, "first")
+            time.sleep(0.1)
+            return "second"
+
+        self.assertEqual(hedger.call(fn, "test_other", "/test"), "second")
+
+    def test_deadline(self):
+        hedger = primed(Hedger(max_rate=1.0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1 if len(calls) == 1 else 0.5)
+            raise DataFailureException("/test", 503, "slow")
+
+        with deadline(0.2):
+            start = time.monotonic()
+            self.assertRaises(DeadlineExceeded, hedger.call, fn, "test",
+                              "/test")
+            self.assertLess(time.monotonic() - start, 0.4)
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_HEDGE={
+                       "get_person_by_netid": {"max_rate": 1.0},
+                       "get_entity_by_netid": {"max_rate": 1.0}},
+                   RESTCLIENTS_PWS_HEDGE_WORKERS=4)
+class PWSTestHedgedRequests(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def failing_first(self, pws, seconds):
+        get_url = pws.dao.getURL
+        calls = []
+
+        def get(url, headers):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(seconds)
+                raise DataFailureException(url, 0, "Timed out")
+            return get_url(url, headers)
+        return patch.object(PWS_DAO, "getURL", side_effect=get)
+
+    def test_person_by_netid(self):
+        pws = PWS()
+        for i in range(20):
+            pws.get_person_by_netid("javerage")
+
+        won = hedges("get_person_by_netid", "won")
+        with self.failing_first(pws, 0.1) as get:
+            person = pws.get_person_by_netid("javerage")
+        self.assertEqual(person.uwnetid, "javerage")
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(hedges("get_person_by_netid", "won"), won + 1)
+
+    def test_entity_by_netid(self):
+        pws = PWS()
+        for i in range(20):
+            pws.get_entity_by_netid("javerage")
+
+        with self.failing_first(pws, 0.1) as get:
+            entity = pws.get_entity_by_netid("javerage")
+        self.assertEqual(entity.uwnetid, "javerage")
+        self.assertEqual(get.call_count, 2)
+
+    def test_not_found(self):
+        pws = PWS()
+        self.assertRaises(DataFailureException, pws.get_person_by_netid,
+                          "nobody")
+
+    def test_not_configured(self):
+        pws = PWS()
+        self.assertIsNone(pws._get_hedger("get_person_by_regid"))
+        self.assertEqual(pws._get_hedger("get_person_by_netid").workers, 4)
@@ -0,0 +1,33 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+import subprocess
+import sys
+
+# Modules too slow to import with the package
+DEFERRED_MODULES = ("nameparser", "restclients_core.dao", "urllib3",
+                    "prometheus_client", "concurrent.futures")
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable] + list(args), capture_output=True, text=True,
+        check=True)
+
+
+class PWSTestImports(TestCase):
+
+    def test_deferred_modules(self):
+        # Checked in a new interpreter, as the tests import them all
+        result = run_python("-c", (
+            "import sys, uw_pws, uw_pws.models, uw_pws.validation; "
+            "print(' '.join(m for m in {!r} if m in sys.modules))").format(
+                DEFERRED_MODULES))
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_lazy_attributes(self):
+        import uw_pws
+        from uw_pws.dao import PWS_DAO
+        self.assertIs(uw_pws.PWS_DAO, PWS_DAO)
+        self.assertRaises(AttributeError, getattr, uw_pws, "NOT_THERE")
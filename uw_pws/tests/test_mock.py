@@ -0,0 +1,115 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from os import makedirs
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from restclients_core.exceptions import DataFailureException
+from restclients_core.util.mock import load_resource_from_path
+from uw_pws import PWS
+from uw_pws.dao import PWS_DAO
+from uw_pws.mock import (
+    FixtureDAO, FixtureStore, register_person, register_entity,
+    register_person_search, reload_resources, synthetic_person_data)
+from uw_pws.util import fdao_pws_override
+
+
+@fdao_pws_override
+class PWSTestFixtureStore(TestCase):
+
+    def test_files(self):
+        dao = PWS_DAO()
+        self.assertIsInstance(dao.get_implementation(), FixtureDAO)
+        paths = dao.service_mock_paths()
+        for url in [
+                "/identity/v2/person/javerage/full.json",
+                "/identity/v2/person/9136CCB8F66711D5BE060004AC494FFE"
+                "/full.json",
+                "/identity/v2/entity/somalt.json",
+                "/identity/v2/person.json?verbose=on&"
+                "changed_since_date=2019&page_size=250",
+                "/idcard/v1/card.json?prox_rfid=1234567890"]:
+            expected = load_resource_from_path(
+                paths[0], "pws", "file", url, {})
+            response = dao.getURL(url, {})
+            self.assertEqual(response.status, expected.status, url)
+            self.assertEqual(response.data, expected.data, url)
+
+        self.assertIs(dao.getURL("/identity/v2/person/javerage/full.json",
+                                 {}).data,
+                      PWS_DAO().getURL(
+                          "/identity/v2/person/javerage/full.json", {}).data)
+        self.assertEqual(dao.getURL(
+            "/identity/v2/person/nobody/full.json", {}).status, 404)
+        self.assertEqual(dao.getURL("/nothing/here.json", {}).status, 404)
+
+        reload_resources()
+        self.assertEqual(dao.getURL(
+            "/identity/v2/entity/somalt.json", {}).status, 200)
+
+    def test_index_file(self):
+        with TemporaryDirectory() as path:
+            directory = join(path, "pws", "file", "identity", "v2", "thing")
+            makedirs(directory)
+            with open(join(directory, "index.html"), "wb") as handle:
+                handle.write(b"index")
+
+            store = FixtureStore()
+            self.assertEqual(store.get("/identity/v2/thing", [path]),
+                             (200, b"index", None))
+            self.assertIsNone(store.get("/identity/v2/other", [path]))
+
+    def test_register(self):
+        pws = PWS()
+        store = pws.dao.fixtures
+        store.register("/identity/v2/person/javerage/full.json",
+                       {"error": "unavailable"}, status=503)
+        self.assertRaises(DataFailureException,
+                          pws.get_person_by_netid, "javerage")
+        self.assertEqual(PWS().get_person_by_netid("javerage").uwnetid,
+                         "javerage")
+        store.unregister("/identity/v2/person/javerage/full.json")
+        self.assertEqual(pws.get_person_by_netid("javerage").uwnetid,
+                         "javerage")
+
+        register_person(pws.dao, synthetic_person_data(
+            7, DisplayName="Seven"))
+        person = pws.get_person_by_regid("{:032X}".format(7))
+        self.assertEqual(person.uwnetid, "user7")
+        self.assertEqual(person.display_name, "Seven")
+        self.assertEqual(pws.get_person_by_netid("user7").uwregid,
+                         person.uwregid)
+        self.assertRaises(DataFailureException,
+                          PWS().get_person_by_netid, "user7")
+
+        register_entity(pws.dao, {"UWNetID": "group7",
+                                  "UWRegID": "{:032X}".format(70),
+                                  "DisplayName": "Group Seven"})
+        self.assertEqual(pws.get_entity_by_netid("group7").display_name,
+                         "Group Seven")
+
+        store.clear()
+        self.assertRaises(DataFailureException,
+                          pws.get_person_by_netid, "user7")
+
+    def test_register_search(self):
+        pws = PWS()
+        register_person_search(
+            pws.dao, [synthetic_person_data(i) for i in range(1, 601)],
+            last_name="user*", edupersonaffiliation_member=True)
+        pages = list(pws.person_search_pages(
+            edupersonaffiliation_member=True, last_name="user*"))
+        self.assertEqual([len(page) for page, cursor in pages],
+                         [250, 250, 100])
+        self.assertEqual(pages[-1][1].rows, 600)
+        self.assertEqual(pages[-1][0][-1].uwnetid, "user600")
+
+        register_person_search(pws.dao, [], last_name="nobody")
+        self.assertEqual(pws.person_search(last_name="nobody"), [])
+
+        register_person_search(
+            pws.dao, [synthetic_person_data(i) for i in range(25)],
+            page_size=10, first_name="User")
+        self.assertEqual(len(pws.person_search(first_name="User",
+                                               page_size=10)), 25)
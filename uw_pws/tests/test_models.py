@@ -2,8 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from unittest import TestCase
-from uw_pws.models import Position, Entity, Person
+import os
+import sys
+import timeit
+from unittest import TestCase, skipUnless
+from uw_pws.models import (
+    Position, Entity, Person, PersonCollection, changed_fields, format_name,
+    format_names)
 
 
 class TestModels(TestCase):
@@ -181,3 +186,212 @@ class TestModels(TestCase):
                           'is_person': False,
                           'is_test_entity': False})
         self.assertTrue(en == en)
+
+    def test_format_names(self):
+        persons = [
+            Person(display_name="Bill Teacher"),
+            Person(display_name="JAMES AVERAGE STUDENT",
+                   first_name="JAMES AVERAGE", surname="STUDENT"),
+            Person(display_name=None, first_name="JAMES AVERAGE",
+                   surname="STUDENT"),
+            Person(first_name="MARY", surname="O'BRIEN")]
+        self.assertEqual(format_names(persons),
+                         [p.get_formatted_name() for p in persons])
+        self.assertEqual(format_names(persons, "{last}, {first}"), [
+            "Bill Teacher", "Student, James", "Student, James",
+            "O'Brien, Mary"])
+        self.assertEqual(format_names([]), [])
+
+    def test_format_name_cache(self):
+        # each distinct name is parsed once, and the rest are cache hits
+        format_name.cache_clear()
+        names = [("FIRST{}".format(i % 50), "LAST") for i in range(500)]
+        formatted = [format_name(first, last) for first, last in names]
+        self.assertEqual(formatted[:2], ["First0 Last", "First1 Last"])
+        self.assertEqual(formatted[50], formatted[0])
+
+        info = format_name.cache_info()
+        self.assertEqual(info.misses, 50)
+        self.assertEqual(info.hits, 450)
+        self.assertEqual(info.currsize, 50)
+
+    @skipUnless(os.environ.get("UW_PWS_BENCHMARK"),
+                "set UW_PWS_BENCHMARK to run benchmarks")
+    def test_format_name_benchmark(self):
+        # memoized and bulk formatting against building a HumanName per
+        # call, for a roster with each name ten times
+        format_name.cache_clear()
+        persons = [Person(first_name="FIRST{}".format(i % 100),
+                          surname="LAST") for i in range(1000)]
+
+        uncached = timeit.timeit(lambda: [format_name.__wrapped__(
+            p.first_name, p.surname) for p in persons], number=1)
+        memoized = timeit.timeit(lambda: [
+            p.get_formatted_name() for p in persons], number=1)
+        bulk = timeit.timeit(lambda: format_names(persons), number=1)
+        print("\nHumanName per call: {:.4f}s, get_formatted_name: {:.4f}s, "
+              "format_names: {:.4f}s".format(uncached, memoized, bulk),
+              file=sys.stderr)
+
+        self.assertLess(memoized, uncached)
+        self.assertLess(bulk, uncached)
+
+    def test_affiliation_flags(self):
+        person = Person.from_json({
+            "UWNetID": "bill",
+            "EduPersonAffiliations": ["member", "alum", "faculty", "staff",
+                                      "employee"],
+            "PersonAffiliations": {
+                "StudentPersonAffiliation": {
+                    "StudentAffiliationState": "prior"},
+                "AlumPersonAffiliation": {
+                    "AlumAffiliationState": "current"},
+                "EmployeePersonAffiliation": {
+                    "EmployeeAffiliationState": "current",
+                    "EmployeeWhitePages": {
+                        "Positions": [
+                            {"EWPDept": "Family Medicine",
+                             "EWPTitle": "Associate Professor",
+                             "Primary": False},
+                            {"EWPDept": "University of Washington",
+                             "EWPTitle": "Retiree",
+                             "Primary": True}]}}}})
+        self.assertEqual(
+            person.affiliation_flags,
+            Person.FLAG_ALUM | Person.FLAG_FACULTY | Person.FLAG_STAFF |
+            Person.FLAG_EMPLOYEE | Person.FLAG_STUD_PRIOR |
+            Person.FLAG_ALUM_CURRENT | Person.FLAG_EMP_CURRENT |
+            Person.FLAG_RETIREE)
+        self.assertTrue(person.is_retiree())
+        self.assertEqual(person.get_primary_position().title, "Retiree")
+
+        person.positions = person.positions[:1]
+        self.assertIsNone(person.get_primary_position())
+        self.assertFalse(person.is_retiree())
+        person.positions.append(Position(title="Retiree", is_primary=True))
+        self.assertTrue(person.is_retiree())
+        person.positions[0].is_primary = True
+        person.positions[1].is_primary = False
+        self.assertEqual(person.get_primary_position().title,
+                         "Associate Professor")
+        self.assertFalse(person.is_retiree())
+        person.positions[0].is_primary = False
+        person.positions[1].is_primary = True
+
+        self.assertTrue(person.affiliation_flags & Person.FLAG_RETIREE)
+        person.positions[1].is_primary = False
+        self.assertFalse(person.affiliation_flags & Person.FLAG_RETIREE)
+        person.positions[1].is_primary = True
+
+        # flags follow the attributes they're worked out from
+        person.employee_state = Person.PRIOR
+        self.assertEqual(
+            person.affiliation_flags & (
+                Person.FLAG_EMP_CURRENT | Person.FLAG_EMP_PRIOR |
+                Person.FLAG_RETIREE),
+            Person.FLAG_EMP_PRIOR)
+
+        self.assertEqual(Person().affiliation_flags, 0)
+        self.assertEqual(Person(is_student=True).affiliation_flags,
+                         Person.FLAG_STUDENT)
+        self.assertEqual(
+            Person.from_bytes(person.to_bytes()).affiliation_flags,
+            person.affiliation_flags)
+
+    def test_person_collection(self):
+        retiree = Person(uwnetid="retiree", is_employee=True,
+                         employee_state=Person.CURRENT)
+        retiree.positions.append(Position(title="Retiree", is_primary=True))
+        persons = PersonCollection([
+            Person(uwnetid="emp", is_employee=True,
+                   employee_state=Person.CURRENT),
+            retiree,
+            Person(uwnetid="former", is_alum=True,
+                   employee_state=Person.PRIOR),
+            Person(uwnetid="student", is_student=True,
+                   student_state=Person.CURRENT)])
+        self.assertEqual(len(persons), 4)
+
+        current = persons.filter(all_of=Person.FLAG_EMP_CURRENT,
+                                 none_of=Person.FLAG_RETIREE)
+        self.assertEqual([p.uwnetid for p in current], ["emp"])
+        self.assertEqual(
+            persons.mask(all_of=Person.FLAG_EMP_CURRENT,
+                         none_of=Person.FLAG_RETIREE),
+            [True, False, False, False])
+        self.assertEqual(persons.count(
+            any_of=Person.FLAG_STUDENT | Person.FLAG_ALUM), 2)
+        self.assertEqual(len(persons.filter()), 4)
+        self.assertEqual(persons[1].uwnetid, "retiree")
+        self.assertEqual([p.uwnetid for p in persons[2:]],
+                         ["former", "student"])
+        self.assertEqual(
+            persons[2:].count(all_of=Person.FLAG_EMP_PRIOR), 1)
+
+    def test_fingerprint(self):
+        data = {"UWRegID": "9136CCB8F66711D5BE060004AC494FFE",
+                "UWNetID": "javerage",
+                "DisplayName": "James Average",
+                "RegisteredFirstMiddleName": "James",
+                "RegisteredSurname": "Average",
+                "PriorUWNetIDs": [],
+                "PriorUWRegIDs": [],
+                "EduPersonAffiliations": ["member", "student"],
+                "PersonAffiliations": {"EmployeePersonAffiliation": {
+                    "EmployeeWhitePages": {"Positions": [{
+                        "EWPDept": "Computing", "EWPTitle": "Analyst",
+                        "Primary": True}]}}}}
+        person = Person.from_json(data)
+        same = Person.from_json(dict(data))
+        self.assertEqual(len(person.fingerprint), 32)
+        self.assertEqual(person.fingerprint, same.fingerprint)
+        self.assertEqual(person.fingerprint,
+                         Person.from_bytes(person.to_bytes()).fingerprint)
+        self.assertEqual(changed_fields(person, same), set())
+
+        changed = Person.from_json(dict(
+            data, DisplayName="Jim Average", PriorUWNetIDs=["jim"],
+            EduPersonAffiliations=["member"]))
+        self.assertNotEqual(person.fingerprint, changed.fingerprint)
+        self.assertEqual(changed_fields(person, changed),
+                         {"display_name", "prior_uwnetids", "is_student"})
+
+        position = person.positions[0]
+        self.assertEqual(position.fingerprint,
+                         Position.from_json({
+                             "EWPDept": "Computing", "EWPTitle": "Analyst",
+                             "Primary": True}).fingerprint)
+        other = Position.from_json({
+            "EWPDept": "Computing", "EWPTitle": "Manager", "Primary": True})
+        self.assertEqual(changed_fields(position, other), {"title"})
+
+        entity = Entity.from_json(data)
+        self.assertEqual(entity.fingerprint,
+                         Entity.from_json(dict(data)).fingerprint)
+        self.assertEqual(changed_fields(entity, Entity.from_json(dict(
+            data, PriorUWRegIDs=["FBB38FE46A7C11D5A4AE0004AC494FFE"]))),
+            {"prior_uwregids"})
+
+    def test_fingerprint_changes(self):
+        entity = Entity(uwnetid="javerage", display_name="James")
+        fingerprint = entity.fingerprint
+        entity.display_name = "Jim"
+        self.assertNotEqual(entity.fingerprint, fingerprint)
+        self.assertEqual(
+            Entity(uwnetid="javerage", display_name="Jim").fingerprint,
+            entity.fingerprint)
+
+        old = Person.from_bytes(Person(uwnetid="javerage").to_bytes())
+        new = Person.from_bytes(old.to_bytes())
+        self.assertEqual(changed_fields(old, new), set())
+        new.surname = "Average"
+        new.prior_uwnetids = ["javg"]
+        self.assertEqual(changed_fields(old, new),
+                         {"surname", "prior_uwnetids"})
+        new.surname = old.surname
+        new.prior_uwnetids = []
+        self.assertEqual(new.fingerprint, old.fingerprint)
+
+        # Lists changed in place are seen too
+        new.prior_uwnetids.append("javg")
+        self.assertEqual(changed_fields(old, new), {"prior_uwnetids"})
@@ -3,7 +3,11 @@
 
 import logging
 from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
 from uw_pws import PWS
+from uw_pws.cache import clear_caches
+from uw_pws.dao import PWS_DAO
 from restclients_core.exceptions import (InvalidRegID, InvalidNetID,
                                          DataFailureException,
                                          InvalidEmployeeID)
@@ -242,3 +246,62 @@ class PWSTestPersonData(TestCase):
         person = pws.get_person_by_netid('bill')
         self.assertEqual(person.display_name, "Bill Teacher")
         self.assertEqual(person.get_formatted_name(), "Bill Teacher")
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_NEGATIVE_CACHE_TTL=60)
+class PWSTestNegativeCache(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def _assert_cached_miss(self, method, value):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            with self.assertRaises(DataFailureException) as cm:
+                method(pws, value)
+            with self.assertRaises(DataFailureException) as cached:
+                method(pws, value)
+            self.assertEqual(m.call_count, 1)
+
+        self.assertEqual(cached.exception.url, cm.exception.url)
+        self.assertEqual(cached.exception.status, 404)
+        self.assertEqual(cached.exception.msg, cm.exception.msg)
+
+    def test_no_person_found(self):
+        self._assert_cached_miss(PWS.get_person_by_employee_id, '999999999')
+        self._assert_cached_miss(PWS.get_person_by_student_number, '9999999')
+
+    def test_not_found(self):
+        self._assert_cached_miss(PWS.get_person_by_netid, 'hello')
+        self._assert_cached_miss(PWS.get_person_by_regid,
+                                 '9136CCB8F66711D5BE060004AC494FFF')
+
+    def test_found(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            pws.get_person_by_netid('javerage')
+            pws.get_person_by_netid('javerage')
+            self.assertEqual(m.call_count, 2)
+
+    def test_actas(self):
+        with patch.object(PWS_DAO, "getURL", wraps=PWS().dao.getURL) as m:
+            for pws in (PWS(actas="javerage"), PWS(), PWS(actas="bill")):
+                self.assertRaises(DataFailureException,
+                                  pws.get_person_by_netid, 'hello')
+            self.assertRaises(DataFailureException,
+                              PWS().get_person_by_netid, 'hello')
+            self.assertEqual(m.call_count, 3)
+
+    def test_other_requests(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as m:
+            for i in range(2):
+                self.assertRaises(DataFailureException, pws.person_search,
+                                  first_name="nobody")
+                self.assertRaises(DataFailureException, pws.get_idcard_photo,
+                                  '9136CCB8F66711D5BE060004AC494FFF')
+            self.assertEqual(m.call_count, 4)
@@ -1,8 +1,14 @@
 # Copyright 2025 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from unittest import TestCase
+from io import BytesIO
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from commonconf import override_settings
+from uw_pws.cache import clear_caches
+from uw_pws.dao import PWS_DAO
 from uw_pws.models import Person
+from uw_pws.photo import can_resize, photo_height, resize_photo
 from uw_pws import PWS
 from uw_pws.exceptions import InvalidIdCardPhotoSize
 from restclients_core.exceptions import (
@@ -66,3 +72,58 @@ class IdCardTestPhoto(TestCase):
                           person.uwregid, -50)
         self.assertRaises(InvalidIdCardPhotoSize, pws.get_idcard_photo,
                           person.uwregid, 20.5)
+
+
+@skipUnless(can_resize(), "Pillow is not installed")
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_PHOTO_RESIZE_TTL=60)
+class IdCardTestPhotoResize(TestCase):
+    regid = "9136CCB8F66711D5BE060004AC494FFE"
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def height(self, img):
+        from PIL import Image
+        return Image.open(img).height
+
+    def test_resize_photo(self):
+        data = PWS().get_idcard_photo(self.regid, "large").getvalue()
+        self.assertEqual(self.height(BytesIO(resize_photo(data, 25))), 25)
+        self.assertEqual(photo_height("medium"), 150)
+        self.assertEqual(photo_height(80), 80)
+
+    def test_one_request(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            self.assertEqual(self.height(pws.get_idcard_photo(
+                self.regid, "small")), 25)
+            self.assertEqual(self.height(pws.get_idcard_photo(
+                self.regid)), 150)
+            self.assertEqual(self.height(pws.get_idcard_photo(
+                self.regid, 80)), 80)
+            large = pws.get_idcard_photo(self.regid, "large").getvalue()
+            self.assertIs(pws.get_idcard_photo(self.regid, "small").getvalue(),
+                          pws.get_idcard_photo(self.regid, "small").getvalue())
+            self.assertEqual(get.call_count, 1)
+            self.assertTrue(get.call_args[0][0].endswith("-large.jpg"))
+
+        self.assertEqual(large, PWS_DAO().getURL(
+            "/idcard/v1/photo/{}-large.jpg".format(self.regid), {}).data)
+
+    def test_larger_master(self):
+        pws = PWS()
+        large = pws.get_idcard_photo(self.regid, "large").getvalue()
+        url = "/idcard/v1/photo/{}-600.jpg".format(self.regid)
+        pws.dao.fixtures.register(url, resize_photo(large, 600))
+
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            self.assertEqual(self.height(pws.get_idcard_photo(
+                self.regid, 600)), 600)
+            self.assertEqual(self.height(pws.get_idcard_photo(
+                self.regid, 400)), 400)
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(get.call_args[0][0], url)
@@ -0,0 +1,375 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+import json
+from urllib.parse import parse_qsl
+from commonconf import override_settings
+from prometheus_client import REGISTRY
+from restclients_core.exceptions import DataFailureException
+from restclients_core.models import MockHTTP
+from uw_pws import PWS
+from uw_pws.cache import TTLCache, clear_caches, get_cache
+from uw_pws.dao import PWS_DAO
+from uw_pws.search import (
+    SearchCursor, parse_person_page, affiliation_partitions,
+    last_name_partitions, fan_out_person_search, PageSizeTuner, page_size_of,
+    search_key, with_page_size, LAST_NAME_PREFIXES)
+from uw_pws.util import fdao_pws_override
+
+
+@fdao_pws_override
+class PWSTestSearchPages(TestCase):
+
+    def test_parse_person_page(self):
+        rows = [
+            {"UWNetID": "bill", "UWRegID": "FBB38FE46A7C11D5A4AE0004AC494FFE"}
+        ]
+        persons = parse_person_page(rows)
+        self.assertEqual(persons[0].uwnetid, "bill")
+        self.assertEqual(len(parse_person_page(rows, as_bytes=True)[0]),
+                         len(persons[0].to_bytes()))
+
+    def test_thread_executor(self):
+        expected = [p.json_data() for p in PWS().person_search(
+            changed_since_date=2019)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            persons = PWS(parse_executor=executor).person_search(
+                changed_since_date=2019)
+        self.assertEqual([p.json_data() for p in persons], expected)
+
+    def test_process_executor(self):
+        expected = [p.json_data() for p in PWS().person_search(
+            changed_since_date=2019)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            persons = PWS(parse_executor=executor).person_search(
+                changed_since_date=2019)
+        self.assertEqual([p.json_data() for p in persons], expected)
+        self.assertEqual(persons[0].uwnetid, "javerage")
+
+
+@fdao_pws_override
+class PWSTestSearchCursor(TestCase):
+
+    def test_person_search_pages(self):
+        pws = PWS()
+        pages = list(pws.person_search_pages(changed_since_date=2019))
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(pages[0][0][0].uwnetid, "javerage")
+        self.assertEqual(pages[0][1].pages, 1)
+        self.assertEqual(pages[0][1].rows, 1)
+        self.assertFalse(pages[0][1].done)
+        self.assertEqual(pages[1][1].pages, 2)
+        self.assertEqual(pages[1][1].rows, 2)
+        self.assertTrue(pages[1][1].done)
+
+    def test_resume(self):
+        pws = PWS()
+        pages = pws.person_search_pages(changed_since_date=2019)
+        persons, cursor = next(pages)
+        pages.close()
+
+        saved = json.dumps(cursor.json_data())
+        cursor = SearchCursor.from_json(json.loads(saved))
+        self.assertEqual(cursor.href, "/identity/v2/person.json?"
+                         "changed_since_date=2019&page_size=250&verbose=on"
+                         "&page_start=2")
+
+        persons = pws.person_search(cursor=cursor)
+        self.assertEqual([p.uwnetid for p in persons], ["phil"])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            persons = PWS(parse_executor=executor).person_search(
+                cursor=cursor)
+        self.assertEqual([p.uwnetid for p in persons], ["phil"])
+
+        resumed = list(pws.person_search_pages(cursor=cursor))
+        self.assertEqual(resumed[-1][1], SearchCursor(None, 2, 2))
+        self.assertEqual(pws.person_search(cursor=resumed[-1][1]), [])
+
+    def test_entity_search_pages(self):
+        pages = list(PWS().entity_search_pages(is_test_entity=True))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0][0][0].uwnetid, "javerage")
+        self.assertTrue(pages[0][1].done)
+
+    def test_no_retry(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            get.side_effect = DataFailureException("/", 503, "Unavailable")
+            self.assertRaises(DataFailureException, pws.person_search,
+                              changed_since_date=2019)
+            self.assertEqual(get.call_count, 1)
+
+
+@fdao_pws_override
+class PWSTestFanOut(TestCase):
+
+    def test_partitions(self):
+        partitions = affiliation_partitions(("student", "staff"),
+                                            changed_since_date=2019)
+        self.assertEqual(partitions, [
+            {"changed_since_date": 2019, "edupersonaffiliation_student": True},
+            {"changed_since_date": 2019, "edupersonaffiliation_staff": True}])
+
+        partitions = last_name_partitions(LAST_NAME_PREFIXES,
+                                          first_name="bill")
+        self.assertEqual(len(partitions), 37)
+        self.assertEqual(partitions[1], {"first_name": "bill",
+                                         "last_name": "b*"})
+
+    def test_last_name_prefixes(self):
+        surnames = {"able": "Able", "orsted": "\u00d8rsted",
+                    "thooft": "'t Hooft", "pac": "2pac"}
+
+        def get_url(url, headers):
+            params = dict(parse_qsl(url.partition("?")[2]))
+            prefix = params["last_name"].rstrip("*")
+            response = MockHTTP()
+            response.status = 200
+            response.data = json.dumps({"Persons": [
+                {"UWNetID": netid, "UWRegID": "{:032X}".format(i)} for (
+                    i, netid) in enumerate(sorted(surnames)) if (
+                    surnames[netid].casefold().startswith(prefix))],
+                "Next": None}).encode("utf-8")
+            return response
+
+        with patch.object(PWS_DAO, "getURL", side_effect=get_url):
+            result = fan_out_person_search(PWS(), last_name_partitions(
+                LAST_NAME_PREFIXES))
+            self.assertEqual(sorted(p.uwnetid for p in result.persons),
+                             ["able", "pac", "thooft"])
+
+            result = fan_out_person_search(PWS(), last_name_partitions(
+                LAST_NAME_PREFIXES + ("\u00f8",)))
+            self.assertEqual(sorted(p.uwnetid for p in result.persons),
+                             ["able", "orsted", "pac", "thooft"])
+
+    def test_fan_out(self):
+        result = fan_out_person_search(PWS(), [
+            {"changed_since_date": 2019}, {"changed_since_date": 2019}])
+        self.assertEqual([p.uwnetid for p in result.persons],
+                         ["javerage", "phil"])
+        self.assertEqual(len(result.timings), 2)
+        for timing in result.timings:
+            self.assertEqual(timing.params, {"changed_since_date": 2019})
+            self.assertEqual(timing.pages, 2)
+            self.assertEqual(timing.rows, 2)
+            self.assertGreaterEqual(timing.seconds, 0)
+
+        self.assertRaises(DataFailureException, fan_out_person_search,
+                          PWS(), [{"changed_since_date": 2020}])
+        self.assertEqual(fan_out_person_search(PWS(), []).persons, [])
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_SEARCH_PAGE_TRIES=3,
+                   RESTCLIENTS_PWS_SEARCH_PAGE_RETRY_DELAY=0.001)
+class PWSTestSearchRetry(TestCase):
+
+    def test_retry(self):
+        pws = PWS()
+        get_url = pws.dao.getURL
+        failures = [DataFailureException("/", 503, "Unavailable")]
+
+        def flaky(url, headers):
+            if "page_start" in url and failures:
+                raise failures.pop()
+            return get_url(url, headers)
+
+        with patch.object(PWS_DAO, "getURL", side_effect=flaky) as get:
+            persons = pws.person_search(changed_since_date=2019)
+            self.assertEqual(len(persons), 2)
+            self.assertEqual(get.call_count, 3)
+
+    def test_not_found(self):
+        pws = PWS()
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            self.assertRaises(DataFailureException, pws.person_search,
+                              changed_since_date=2020)
+            self.assertEqual(get.call_count, 1)
+
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            get.side_effect = DataFailureException("/", 503, "Unavailable")
+            self.assertRaises(DataFailureException, pws.person_search,
+                              changed_since_date=2019)
+            self.assertEqual(get.call_count, 3)
+
+
+def fake_search(total):
+    """
+    Returns a getURL standing in for a person search of total rows, and the
+    list of page sizes requested from it.
+    """
+    sizes = []
+
+    def get_url(url, headers):
+        params = dict(parse_qsl(url.partition("?")[2]))
+        start = int(params.get("page_start", 1))
+        size = int(params["page_size"])
+        sizes.append(size)
+        end = min(start + size, total + 1)
+        data = {
+            "Persons": [{"UWNetID": "user{}".format(i),
+                         "UWRegID": "{:032X}".format(i)} for (
+                             i) in range(start, end)],
+            "MaxResultSize": 500,
+            "Next": None,
+        }
+        if end <= total:
+            data["Next"] = {"Href": with_page_size(
+                "/identity/v2/person.json?last_name=a*&verbose=on&"
+                "page_start={}".format(end), size)}
+        response = MockHTTP()
+        response.status = 200
+        response.data = json.dumps(data).encode("utf-8")
+        return response
+    return get_url, sizes
+
+
+@fdao_pws_override
+class PWSTestPageSize(TestCase):
+
+    def test_page_size_of(self):
+        self.assertEqual(page_size_of(
+            "/identity/v2/person.json?a=1&page_size=50&verbose=on"), 50)
+        self.assertIsNone(page_size_of("/identity/v2/person.json?a=1"))
+        self.assertEqual(page_size_of(with_page_size(
+            "/identity/v2/person.json?a=b+c&page_size=50", 100)), 100)
+        self.assertEqual(with_page_size("/x?a=b+c&page_size=50", 100),
+                         "/x?a=b+c&page_size=100")
+
+    def test_tuner(self):
+        tuner = PageSizeTuner(target_seconds=1.0, max_bytes=1000,
+                              min_size=10, max_size=500)
+        self.assertEqual(tuner.next_size(100, 0.1, 100), 200)
+        self.assertEqual(tuner.next_size(100, 10, 100), 50)
+        self.assertEqual(tuner.next_size(100, 1.0, 500), 100)
+        self.assertEqual(tuner.next_size(100, 0.1, 2000), 50)
+        self.assertEqual(tuner.next_size(400, 0.1, 100), 500)
+        self.assertEqual(tuner.next_size(400, 0.1, 100, 300), 300)
+        self.assertEqual(tuner.next_size(12, 10, 100), 10)
+
+    def test_page_size(self):
+        pws = PWS()
+        get_url, sizes = fake_search(25)
+        with patch.object(PWS_DAO, "getURL", side_effect=get_url):
+            persons = pws.person_search(last_name="a*", page_size=10)
+        self.assertEqual(len(persons), 25)
+        self.assertEqual(sizes, [10, 10, 10])
+
+        self.assertRaises(ValueError, pws.person_search, page_size=0)
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                               RESTCLIENTS_PWS_SEARCH_PAGE_SIZE=20):
+            get_url, sizes = fake_search(25)
+            with patch.object(PWS_DAO, "getURL", side_effect=get_url):
+                self.assertEqual(len(pws.person_search(last_name="a*")), 25)
+            self.assertEqual(sizes, [20, 20])
+
+    def test_adaptive(self):
+        pws = PWS()
+        before = REGISTRY.get_sample_value(
+            "restclient_pws_search_page_size_count",
+            {"resource": "persons"}) or 0
+        get_url, sizes = fake_search(1200)
+        with patch.object(PWS_DAO, "getURL", side_effect=get_url):
+            persons = pws.person_search(last_name="a*", page_size="adaptive")
+        self.assertEqual(len(persons), 1200)
+        self.assertEqual(len(set(p.uwregid for p in persons)), 1200)
+        self.assertEqual(sizes[:2], [250, 500])
+        self.assertEqual(REGISTRY.get_sample_value(
+            "restclient_pws_search_page_size_count",
+            {"resource": "persons"}) - before, len(sizes))
+
+        get_url, sizes = fake_search(1200)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with patch.object(PWS_DAO, "getURL", side_effect=get_url):
+                persons = PWS(parse_executor=executor).person_search(
+                    last_name="a*", page_size="adaptive")
+        self.assertEqual(len(persons), 1200)
+        self.assertEqual(sizes[:2], [250, 500])
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_SEARCH_CACHE_TTL=60)
+class PWSTestSearchCache(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_search_key(self):
+        self.assertEqual(
+            search_key("persons", {"last_name": "smith", "page_size": 10,
+                                   "edupersonaffiliation_staff": True}),
+            search_key("persons", {"edupersonaffiliation_staff": "true",
+                                   "last_name": "smith"}))
+        self.assertNotEqual(search_key("persons", {"last_name": "smith"}),
+                            search_key("entities", {"last_name": "smith"}))
+        self.assertNotEqual(
+            search_key("persons", {"last_name": "smith"}, "a.uw.edu"),
+            search_key("persons", {"last_name": "smith"}, "b.uw.edu"))
+        self.assertNotEqual(
+            search_key("persons", {"last_name": "smith"}, actas="javerage"),
+            search_key("persons", {"last_name": "smith"}))
+
+    def test_person_search(self):
+        pws = PWS()
+        get_url = pws.dao.getURL
+        with patch.object(PWS_DAO, "getURL", side_effect=get_url) as get:
+            persons = pws.person_search(changed_since_date=2019, cache=True)
+            self.assertEqual(get.call_count, 2)
+            cached = pws.person_search(
+                changed_since_date="2019", page_size=250, cache=True)
+            self.assertEqual(get.call_count, 2)
+            self.assertEqual([p.json_data() for p in cached],
+                             [p.json_data() for p in persons])
+
+            pws.person_search(changed_since_date=2019)
+            self.assertEqual(get.call_count, 4)
+
+            # A result dropped from the cache means searching again
+            get_cache("search_records", TTLCache, 60, 100000).clear()
+            pws.person_search(changed_since_date=2019, cache=True)
+            self.assertEqual(get.call_count, 6)
+
+    def test_host_and_actas(self):
+        get_url = PWS().dao.getURL
+        with patch.object(PWS_DAO, "getURL", side_effect=get_url) as get:
+            PWS().entity_search(is_test_entity=True, cache=True)
+            pages = get.call_count
+            PWS(actas="javerage").entity_search(is_test_entity=True,
+                                                cache=True)
+            self.assertEqual(get.call_count, pages * 2)
+            with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                                   RESTCLIENTS_PWS_SEARCH_CACHE_TTL=60,
+                                   RESTCLIENTS_PWS_HOST="https://other"):
+                PWS().entity_search(is_test_entity=True, cache=True)
+            self.assertEqual(get.call_count, pages * 3)
+            with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                                   RESTCLIENTS_PWS_SEARCH_CACHE_TTL=60):
+                PWS().entity_search(is_test_entity=True, cache=True)
+            self.assertEqual(get.call_count, pages * 3)
+
+    def test_expiry(self):
+        pws = PWS()
+        get_url = pws.dao.getURL
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                               RESTCLIENTS_PWS_SEARCH_CACHE_TTL=0):
+            with patch.object(PWS_DAO, "getURL",
+                              side_effect=get_url) as get:
+                pws.person_search(changed_since_date=2019, cache=True)
+                pws.person_search(changed_since_date=2019, cache=True)
+                self.assertEqual(get.call_count, 4)
+
+    def test_entity_search(self):
+        pws = PWS()
+        entities = pws.entity_search(is_test_entity=True, cache=True)
+        with patch.object(PWS_DAO, "getURL") as get:
+            cached = pws.entity_search(is_test_entity=True, cache=True)
+            self.assertEqual(get.call_count, 0)
+        self.assertEqual([e.json_data() for e in cached],
+                         [e.json_data() for e in entities])
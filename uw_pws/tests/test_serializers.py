@@ -0,0 +1,72 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import datetime
+from unittest import TestCase
+import json
+from uw_pws import PWS
+from uw_pws.models import Person, Position
+from uw_pws.serializers import iter_persons_json, persons_json
+from uw_pws.util import fdao_pws_override
+
+
+@fdao_pws_override
+class TestSerializers(TestCase):
+
+    def _persons(self):
+        pws = PWS()
+        return [pws.get_person_by_netid(netid) for netid in (
+            "javerage", "bill", "finals1", "none")]
+
+    def test_json_fields(self):
+        person = PWS().get_person_by_netid("javerage")
+        self.assertEqual(list(person.json_data().keys()),
+                         list(Person.JSON_FIELDS))
+
+    def test_persons_json(self):
+        persons = self._persons()
+        self.assertEqual(json.loads(persons_json(persons)),
+                         [p.json_data() for p in persons])
+        self.assertEqual(persons_json([]), b"[]")
+
+    def test_fields(self):
+        persons = self._persons()
+        data = json.loads(persons_json(
+            persons, fields=["positions", "uwnetid"]))
+        self.assertEqual(data[1], {
+            "uwnetid": "bill",
+            "positions": persons[1].json_data()["positions"]})
+        self.assertEqual(list(data[1].keys()), ["uwnetid", "positions"])
+
+        self.assertEqual(json.loads(persons_json(persons, fields=[])),
+                         [{}, {}, {}, {}])
+        self.assertRaises(ValueError, persons_json, persons,
+                          fields=["uwnetid", "password"])
+
+    def test_chunks(self):
+        persons = self._persons()
+        chunks = list(iter_persons_json(persons, chunk_size=1))
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual(json.loads(b"".join(chunks)),
+                         [p.json_data() for p in persons])
+
+    def test_values(self):
+        person = Person(uwnetid="jé",
+                        repository_time_stamp=datetime(2020, 1, 1))
+        person.phones = ["+1 206 555-1212"]
+        data = json.loads(persons_json([person], fields=[
+            "uwnetid", "repository_time_stamp", "phones"]))
+        self.assertEqual(data, [{"uwnetid": "jé",
+                                 "repository_time_stamp":
+                                     "2020-01-01T00:00:00",
+                                 "phones": ["+1 206 555-1212"]}])
+
+    def test_positions(self):
+        person = Person(uwnetid="javerage")
+        person.positions = [
+            Position(department="Computing", title="Analyst",
+                     is_primary=True),
+            Position()]
+        data = json.loads(persons_json([person], fields=["positions"]))
+        self.assertEqual(data, [{"positions": [
+            p.json_data() for p in person.positions]}])
@@ -0,0 +1,153 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from threading import Thread
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import json
+import time
+from commonconf import override_settings
+from restclients_core.dao import LiveDAO
+from restclients_core.exceptions import DataFailureException
+from uw_pws import PWS
+from uw_pws.load import percentile, run_load, operations, format_report
+from uw_pws.server import StandIn, make_server
+
+
+class PWSTestStandIn(TestCase):
+
+    def test_respond(self):
+        stand_in = StandIn(persons=30)
+        status, content_type, body = stand_in.respond(
+            "/identity/v2/person/javerage/full.json")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["UWNetID"], "javerage")
+
+        status, content_type, body = stand_in.respond(
+            "/identity/v2/person/user30/full.json")
+        self.assertEqual(json.loads(body)["UWRegID"], "{:032X}".format(30))
+        self.assertEqual(stand_in.respond(
+            "/identity/v2/person/user31/full.json")[0], 404)
+        self.assertEqual(stand_in.respond(
+            "/identity/v2/entity/{:032X}.json".format(2))[0], 200)
+
+        status, content_type, body = stand_in.respond(
+            "/idcard/v1/photo/{:032X}-small.jpg".format(3))
+        self.assertEqual((status, content_type), (200, "image/jpeg"))
+
+        status, content_type, body = stand_in.respond(
+            "/identity/v2/person.json?first_name=user&page_size=20"
+            "&verbose=on")
+        data = json.loads(body)
+        self.assertEqual(len(data["Persons"]), 20)
+        status, content_type, body = stand_in.respond(data["Next"]["Href"])
+        data = json.loads(body)
+        self.assertEqual(len(data["Persons"]), 10)
+        self.assertEqual(data["Persons"][-1]["UWNetID"], "user30")
+        self.assertIsNone(data["Next"])
+
+    def test_search_params(self):
+        stand_in = StandIn(persons=30)
+
+        def search(query):
+            status, content_type, body = stand_in.respond(
+                "/identity/v2/person.json?{}&page_size=5".format(query))
+            data = json.loads(body)
+            return data["TotalCount"], [
+                person["UWNetID"] for person in data["Persons"]]
+
+        self.assertEqual(search("last_name=1%2A"), (11, [
+            "user1", "user10", "user11", "user12", "user13"]))
+        self.assertEqual(search("uwnetid=USER7"), (1, ["user7"]))
+        self.assertEqual(search("first_name=nobody"), (0, []))
+        self.assertEqual(search("edupersonaffiliation_member=true&"
+                                "last_name=3%2A"), (2, ["user3", "user30"]))
+        self.assertEqual(search("edupersonaffiliation_student=true"),
+                         (0, []))
+        self.assertEqual(search("changed_since_date=2019")[0], 30)
+
+        status, content_type, body = stand_in.respond(
+            "/identity/v2/person.json?last_name=1%2A&page_size=5"
+            "&page_start=11")
+        self.assertEqual(json.loads(body)["Persons"][0]["UWNetID"], "user19")
+        self.assertIsNone(json.loads(body)["Next"])
+
+    def test_errors(self):
+        stand_in = StandIn(error_rate=1.0, error_status=500)
+        self.assertEqual(stand_in.respond(
+            "/identity/v2/person/javerage/full.json")[0], 500)
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Live',
+                   RESTCLIENTS_PWS_HOST='http://127.0.0.1:0',
+                   RESTCLIENTS_PWS_TIMEOUT=5)
+class PWSTestStandInServer(TestCase):
+
+    def setUp(self):
+        self.server = make_server(persons=600, latency=0.001)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.host = "http://{}:{}".format(*self.server.server_address)
+        LiveDAO.pools.pop("pws", None)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        LiveDAO.pools.pop("pws", None)
+
+    def test_http(self):
+        with urlopen(self.host + "/identity/v2/entity/somalt.json") as r:
+            self.assertEqual(json.loads(r.read())["UWNetID"], "somalt")
+        with self.assertRaises(HTTPError) as cm:
+            urlopen(self.host + "/identity/v2/entity/nobody.json")
+        self.assertEqual(cm.exception.code, 404)
+
+    def test_client(self):
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Live',
+                               RESTCLIENTS_PWS_HOST=self.host):
+            pws = PWS()
+            self.assertEqual(pws.get_person_by_netid("user5").uwregid,
+                             "{:032X}".format(5))
+            self.assertEqual(pws.get_person_by_netid("javerage").uwnetid,
+                             "javerage")
+            self.assertEqual(len(pws.person_search(first_name="user")), 600)
+            self.assertEqual(len(pws.person_search(last_name="6*")), 12)
+            self.assertRaises(DataFailureException,
+                              pws.get_person_by_netid, "user601")
+
+            report = run_load(operations(pws, 600, seed=1)["person"],
+                              qps=200, duration=0.25)
+        self.assertEqual(report.requests, 50)
+        self.assertEqual(report.errors, 0)
+        self.assertGreater(report.latencies[50], 0)
+        self.assertIn("p99", format_report(report))
+
+
+class PWSTestLoad(TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3], 90), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_run_load(self):
+        def call(i):
+            if i % 4 == 0:
+                raise ValueError(i)
+
+        report = run_load(call, qps=400, duration=0.1)
+        self.assertEqual(report.requests, 40)
+        self.assertEqual(report.errors, 10)
+        self.assertGreater(report.qps, 0)
+        self.assertEqual(sorted(report.latencies), [50, 90, 95, 99])
+
+    def test_scheduled_latency(self):
+        # One worker falls behind a schedule of a call every 10 ms, and
+        # the calls left waiting count the wait
+        report = run_load(lambda i: time.sleep(0.02), qps=100,
+                          duration=0.1, workers=1)
+        self.assertEqual(report.requests, 10)
+        self.assertGreater(report.latencies[99], 0.1)
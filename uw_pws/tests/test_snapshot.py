@@ -0,0 +1,137 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import stat
+from uw_pws import PWS
+from uw_pws.mock import register_person_search, synthetic_person_data
+from uw_pws.models import Person
+from uw_pws.snapshot import (
+    PersonSnapshot, write_person_snapshot, write_snapshot)
+from uw_pws.util import fdao_pws_override
+
+
+def persons(count):
+    return [Person.from_json(synthetic_person_data(
+        i, PriorUWNetIDs=["old{}".format(i)])) for i in range(1, count + 1)]
+
+
+class PWSTestSnapshot(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = join(self.directory.name, "persons.snapshot")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookups(self):
+        found = persons(500)
+        found.reverse()
+        found.append(Person(uwnetid="noregid"))
+        found.append(Person(uwregid="{:032X}".format(7), uwnetid="seven"))
+        found.append(Person(uwregid="{:032X}".format(1000)))
+        self.assertEqual(write_snapshot(found, self.path), 501)
+
+        with PersonSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 501)
+            self.assertFalse(snapshot.get_person_by_regid(
+                "{:032X}".format(1000)).uwnetid)
+            for i in (1, 7, 250, 500):
+                regid = "{:032X}".format(i)
+                person = snapshot.get_person_by_regid(regid.lower())
+                self.assertEqual(person.uwregid, regid)
+                if i != 7:
+                    self.assertEqual(
+                        snapshot.get_person_by_netid(
+                            "USER{}".format(i)).json_data(),
+                        person.json_data())
+            self.assertEqual(snapshot.get_person_by_regid(
+                "{:032X}".format(7)).uwnetid, "seven")
+            self.assertEqual(snapshot.get_person_by_netid(
+                "user500").prior_uwnetids, ["old500"])
+
+            self.assertIsNone(snapshot.get_person_by_netid("user7"))
+            self.assertIsNone(snapshot.get_person_by_netid("user501"))
+            self.assertIsNone(snapshot.get_person_by_netid("noregid"))
+            self.assertIsNone(snapshot.get_person_by_netid("a" * 100))
+            self.assertIsNone(snapshot.get_person_by_regid(
+                "{:032X}".format(501)))
+            self.assertIsNone(snapshot.get_person_by_regid("1234"))
+            self.assertIn("user1", snapshot)
+            self.assertNotIn("user0", snapshot)
+            self.assertIn("{:032X}".format(1), snapshot)
+
+            regids = [person.uwregid for person in snapshot]
+            self.assertEqual(regids, sorted(regids))
+            self.assertEqual(len(regids), 501)
+
+    def test_contains(self):
+        netid = "n" * 32
+        write_snapshot(persons(1) + [
+            Person(uwregid="{:032X}".format(2), uwnetid=netid)], self.path)
+
+        with PersonSnapshot(self.path) as snapshot:
+            self.assertIn(netid, snapshot)
+            self.assertIn(netid.upper(), snapshot)
+            self.assertIn("{:032x}".format(2), snapshot)
+            self.assertIn("user1", snapshot)
+            self.assertNotIn("m" * 32, snapshot)
+            self.assertNotIn("{:032X}".format(3), snapshot)
+
+    def test_empty(self):
+        write_snapshot([], self.path)
+        with PersonSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertIsNone(snapshot.get_person_by_netid("javerage"))
+            self.assertEqual(list(snapshot), [])
+
+    def test_replace(self):
+        write_snapshot(persons(2), self.path)
+        snapshot = PersonSnapshot(self.path)
+        write_snapshot(persons(3), self.path)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.get_person_by_netid("user2").uwnetid,
+                         "user2")
+        snapshot.close()
+        with PersonSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+
+    def test_mode(self):
+        with patch("uw_pws.snapshot.os.fsync", wraps=os.fsync) as fsync:
+            write_snapshot(persons(1), self.path)
+            self.assertEqual(fsync.call_count, 1)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+        write_snapshot(persons(1), self.path, mode=0o640)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"x" * 100)
+        self.assertRaises(ValueError, PersonSnapshot, self.path)
+        with open(self.path, "wb") as handle:
+            handle.write(b"x")
+        self.assertRaises(ValueError, PersonSnapshot, self.path)
+
+
+@fdao_pws_override
+class PWSTestPersonSearchSnapshot(TestCase):
+
+    def test_write_person_snapshot(self):
+        pws = PWS()
+        register_person_search(
+            pws.dao, [synthetic_person_data(i) for i in range(1, 26)],
+            page_size=10, last_name="user*")
+        with TemporaryDirectory() as directory:
+            path = join(directory, "persons.snapshot")
+            self.assertEqual(write_person_snapshot(
+                pws, path, last_name="user*", page_size=10), 25)
+            with PersonSnapshot(path) as snapshot:
+                self.assertEqual(
+                    snapshot.get_person_by_netid("user25").display_name,
+                    "User 25")
@@ -0,0 +1,125 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import patch
+import gzip
+import json
+import sys
+import zlib
+from commonconf import override_settings
+from prometheus_client import REGISTRY
+from restclients_core.dao import LiveDAO
+from restclients_core.exceptions import DataFailureException
+from restclients_core.models import CacheHTTP
+from uw_pws import PWS
+from uw_pws.dao import PWS_DAO
+from uw_pws.server import make_server
+from uw_pws.transfer import accept_encoding, decode_response, decompress
+
+
+def response_bytes(encoding, stage):
+    return REGISTRY.get_sample_value(
+        "restclient_pws_response_bytes_total",
+        {"encoding": encoding, "stage": stage}) or 0
+
+
+class PWSTestDecompress(TestCase):
+
+    def test_decompress(self):
+        data = json.dumps({"Persons": ["x" * 100] * 2000}).encode("utf-8")
+        self.assertEqual(decompress(gzip.compress(data), "gzip"), data)
+        self.assertEqual(decompress(zlib.compress(data), "deflate"), data)
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        self.assertEqual(decompress(
+            raw.compress(data) + raw.flush(), "deflate"), data)
+        self.assertRaises(ValueError, decompress, data, "compress")
+        self.assertRaises(zlib.error, decompress, data, "gzip")
+
+    def test_cached_decoded(self):
+        response = CacheHTTP()
+        response.status = 200
+        response.data = b'{"a":1}'
+        response.headers = {"Content-Encoding": "gzip"}
+        self.assertEqual(decode_response(response), b'{"a":1}')
+
+        response.headers = {"Content-Encoding": "deflate"}
+        self.assertEqual(decode_response(response), b'{"a":1}')
+
+        response.data = gzip.compress(b'{"a":1}')
+        response.headers = {"Content-Encoding": "gzip"}
+        self.assertEqual(decode_response(response), b'{"a":1}')
+
+    def test_accept_encoding(self):
+        self.assertIn("gzip", accept_encoding(True))
+        self.assertIn("gzip", accept_encoding("True"))
+        self.assertEqual(accept_encoding("gzip"), "gzip")
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_ACCEPT_ENCODING='gzip')
+class PWSTestCompressedMock(TestCase):
+    url = "/identity/v2/person/javerage/full.json"
+
+    def test_gzip_fixture(self):
+        pws = PWS()
+        data = pws.dao.getURL(self.url, {}).data
+        compressed = gzip.compress(data)
+        pws.dao.fixtures.register(self.url, compressed, headers={
+            "content-encoding": "gzip"})
+
+        before = (response_bytes("gzip", "transferred"),
+                  response_bytes("gzip", "decoded"))
+        with patch.object(PWS_DAO, "getURL", wraps=pws.dao.getURL) as get:
+            self.assertEqual(pws.get_person_by_netid("javerage").uwnetid,
+                             "javerage")
+            self.assertEqual(get.call_args[0][1]["Accept-Encoding"], "gzip")
+        self.assertEqual(
+            response_bytes("gzip", "transferred") - before[0],
+            len(compressed))
+        self.assertEqual(response_bytes("gzip", "decoded") - before[1],
+                         len(data))
+
+    def test_identity(self):
+        before = response_bytes("identity", "decoded")
+        PWS().get_person_by_netid("javerage")
+        self.assertEqual(response_bytes("identity", "decoded"), before)
+
+    def test_brotli_not_installed(self):
+        pws = PWS()
+        pws.dao.fixtures.register(self.url, b"not decodable", headers={
+            "Content-Encoding": "br"})
+        with patch.dict(sys.modules, {"brotli": None, "brotlicffi": None}):
+            self.assertNotIn("br", accept_encoding(True))
+            with self.assertRaises(DataFailureException) as cm:
+                pws.get_person_by_netid("javerage")
+        self.assertEqual(cm.exception.status, 200)
+
+
+class PWSTestCompressedLive(TestCase):
+
+    def setUp(self):
+        self.server = make_server(persons=500)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.host = "http://{}:{}".format(*self.server.server_address)
+        LiveDAO.pools.pop("pws", None)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        LiveDAO.pools.pop("pws", None)
+
+    def test_search(self):
+        before = (response_bytes("gzip", "transferred"),
+                  response_bytes("gzip", "decoded"))
+        with override_settings(RESTCLIENTS_PWS_DAO_CLASS='Live',
+                               RESTCLIENTS_PWS_HOST=self.host,
+                               RESTCLIENTS_PWS_ACCEPT_ENCODING=True):
+            persons = PWS().person_search(first_name="user")
+        self.assertEqual(len(persons), 500)
+
+        transferred = response_bytes("gzip", "transferred") - before[0]
+        decoded = response_bytes("gzip", "decoded") - before[1]
+        self.assertGreater(transferred, 0)
+        self.assertLess(transferred * 5, decoded)
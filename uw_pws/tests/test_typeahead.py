@@ -0,0 +1,110 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from uw_pws import PWS
+from uw_pws.mock import synthetic_person_data
+from uw_pws.models import Person
+from uw_pws.typeahead import PersonIndex, normalize
+from uw_pws.util import fdao_pws_override
+
+
+def person(index, display_name, **fields):
+    return Person.from_json(synthetic_person_data(
+        index, DisplayName=display_name, **fields))
+
+
+def netids(persons):
+    return [person.uwnetid for person in persons]
+
+
+class PWSTestPersonIndex(TestCase):
+
+    def setUp(self):
+        self.index = PersonIndex([
+            person(1, "James Average"),
+            person(2, "Jamie Smith", PreferredFirstName="Jay"),
+            person(3, "Zoë García-López"),
+            person(4, "Ann Jameson"),
+            person(12, "Mary O'Brien", UWNetID="jam"),
+        ])
+
+    def test_normalize(self):
+        self.assertEqual(normalize("Zoë García-López"),
+                         ["zoe", "garcia", "lopez"])
+        self.assertEqual(normalize("O'Brien  user_1"),
+                         ["o", "brien", "user", "1"])
+        self.assertEqual(normalize(None), [])
+
+    def test_prefix(self):
+        # Equal words first, then longer words in order
+        self.assertEqual(netids(self.index.search("jam")),
+                         ["jam", "user1", "user4", "user2"])
+        self.assertEqual(netids(self.index.search("JAMES")),
+                         ["user1", "user4"])
+        self.assertEqual(netids(self.index.search("gar")), ["user3"])
+        self.assertEqual(netids(self.index.search("zoe garcia")), ["user3"])
+        self.assertEqual(netids(self.index.search("lóp zo")), ["user3"])
+        self.assertEqual(netids(self.index.search("jay")), ["user2"])
+        self.assertEqual(netids(self.index.search("jam sm")), ["user2"])
+        self.assertEqual(netids(self.index.search("jam xyz")), [])
+        self.assertEqual(netids(self.index.search("")), [])
+        self.assertEqual(len(self.index.search("user", limit=2)), 2)
+
+    def test_exact_netid_first(self):
+        self.index.add(person(10, "Ann User1"))
+        self.assertEqual(netids(self.index.search("user1")),
+                         ["user1", "user10"])
+        self.assertEqual(netids(self.index.search("USER10")), ["user10"])
+        self.assertEqual(netids(self.index.search("jam", limit=1)), ["jam"])
+
+    def test_tokens(self):
+        self.assertEqual(netids(self.index.search("jam", prefix=False)),
+                         ["jam"])
+        self.assertEqual(netids(self.index.search("james", prefix=False)),
+                         ["user1"])
+        self.assertEqual(
+            netids(self.index.search("average james", prefix=False)),
+            ["user1"])
+        self.assertEqual(netids(self.index.search("ave", prefix=False)), [])
+
+    def test_updates(self):
+        index = self.index
+        self.assertEqual(len(index), 5)
+        index.add(person(1, "Jim Average"))
+        self.assertEqual(len(index), 5)
+        self.assertEqual(netids(index.search("james")), ["user4"])
+        self.assertEqual(netids(index.search("jim")), ["user1"])
+
+        index.update([person(5, "James Newman"), person(6, "Jamal Newman")])
+        self.assertEqual(netids(index.search("jam new")), ["user6", "user5"])
+        self.assertIn("{:032x}".format(5), index)
+
+        index.remove("{:032x}".format(3))
+        self.assertNotIn("{:032X}".format(3), index)
+        self.assertEqual(netids(index.search("zoe")), [])
+        self.assertEqual(index._postings.get("zoe"), None)
+        self.assertNotIn("zoe", index._sorted_words)
+        index.remove("{:032X}".format(3))
+
+        index.add(person(12, "Mary O'Brien", UWNetID="mob"))
+        self.assertEqual(netids(index.search("jam", prefix=False)), [])
+        self.assertEqual(netids(index.search("mob")), ["mob"])
+
+    def test_many(self):
+        index = PersonIndex(person(i, "User Number{}".format(i)) for (
+            i) in range(1, 2001))
+        self.assertEqual(netids(index.search("user1000")), ["user1000"])
+        found = netids(index.search("number20 us"))
+        self.assertEqual(found[:4], ["user20", "user200", "user2000",
+                                     "user201"])
+        self.assertEqual(len(found), 10)
+        self.assertEqual(len(index.search("user", limit=25)), 25)
+
+
+@fdao_pws_override
+class PWSTestPersonIndexSearch(TestCase):
+
+    def test_from_person_search(self):
+        index = PersonIndex(PWS().person_search(changed_since_date=2019))
+        self.assertEqual(netids(index.search("javerage")), ["javerage"])
@@ -0,0 +1,75 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase, skipUnless
+from uw_pws import PWS
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = pandas = None
+
+
+class PWSTestBatchValidation(TestCase):
+
+    def test_netids(self):
+        result = PWS().valid_uwnetids(
+            ["javerage", "BILL", "", None, "0notareal_uwnetid", "one two"])
+        self.assertEqual(result.mask,
+                         [True, True, False, False, False, False])
+        self.assertEqual(result.valid, ["javerage", "bill"])
+        self.assertEqual(result.invalid,
+                         ["", None, "0notareal_uwnetid", "one two"])
+
+    def test_regids(self):
+        result = PWS().valid_uwregids(
+            ["9136ccb8f66711d5be060004ac494ffe", "AAA"])
+        self.assertEqual(result.mask, [True, False])
+        self.assertEqual(result.valid, ["9136CCB8F66711D5BE060004AC494FFE"])
+        self.assertEqual(result.invalid, ["AAA"])
+
+    def test_numeric_ids(self):
+        pws = PWS()
+        result = pws.valid_employee_ids(["123456789", 123456789, "12345"])
+        self.assertEqual(result.mask, [True, True, False])
+        self.assertEqual(result.valid, ["123456789", 123456789])
+
+        result = pws.valid_student_numbers(iter(["1234567", "123456"]))
+        self.assertEqual(result.mask, [True, False])
+
+        result = pws.valid_student_system_keys(["001234567", "00123456"])
+        self.assertEqual(result.mask, [True, False])
+
+        result = pws.valid_prox_rfids(["1223221621633408", "1"])
+        self.assertEqual(result.mask, [True, False])
+
+    def test_matches_single_validators(self):
+        pws = PWS()
+        values = ["javerage", "J.Average", "a" * 129, "", " ", "</html>"]
+        self.assertEqual(pws.valid_uwnetids(values).mask,
+                         [pws.valid_uwnetid(v) for v in values])
+
+    @skipUnless(pandas is not None, "pandas is not installed")
+    def test_series(self):
+        series = pandas.Series(["javerage", "BILL", None, "0bad"])
+        result = PWS().valid_uwnetids(series)
+        self.assertEqual(list(result.mask), [True, True, False, False])
+        self.assertEqual(list(result.valid), ["javerage", "bill"])
+        self.assertEqual(list(result.invalid.index), [2, 3])
+
+        result = PWS().valid_employee_ids(
+            pandas.Series([123456789, "123456789", "12345"]))
+        self.assertEqual(list(result.valid), [123456789, "123456789"])
+
+    @skipUnless(numpy is not None, "numpy is not installed")
+    def test_ndarray(self):
+        array = numpy.array(["9136ccb8f66711d5be060004ac494ffe", "AAA"])
+        result = PWS().valid_uwregids(array)
+        self.assertEqual(result.mask, [True, False])
+        self.assertEqual(result.valid, ["9136CCB8F66711D5BE060004AC494FFE"])
+        self.assertEqual(result.invalid, ["AAA"])
+
+        result = PWS().valid_employee_ids(numpy.array([123456789, 12345]))
+        self.assertEqual(result.valid, [123456789])
+        self.assertIsInstance(result.valid[0], numpy.integer)
@@ -0,0 +1,91 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+import time
+from commonconf import override_settings
+from uw_pws import PWS
+from uw_pws.cache import clear_caches
+from uw_pws.dao import PWS_DAO
+from uw_pws.warm import main, read_keys, search_keys, warm
+
+SWR = {"soft_ttl": 60, "hard_ttl": 3600}
+
+
+@override_settings(RESTCLIENTS_PWS_DAO_CLASS='Mock',
+                   RESTCLIENTS_PWS_STALE_WHILE_REVALIDATE={
+                       "get_person_by_netid": SWR,
+                       "get_person_by_regid": SWR,
+                       "get_entity_by_netid": SWR,
+                       "get_entity_by_regid": SWR,
+                       "get_idcard_photo": SWR})
+class PWSTestWarm(TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_warm(self):
+        pws = PWS()
+        report = warm(pws, ["javerage"], photo_sizes=["medium"])
+        self.assertEqual(report.keys, 1)
+        self.assertEqual(report.requests, 3)
+        self.assertEqual(report.errors, 0)
+
+        report = warm(pws, ["FBB38FE46A7C11D5A4AE0004AC494FFE"],
+                      entities=False)
+        self.assertEqual((report.requests, report.errors), (1, 0))
+
+        with patch.object(PWS_DAO, "getURL") as get:
+            self.assertEqual(
+                pws.get_person_by_netid("javerage").uwnetid, "javerage")
+            self.assertEqual(
+                pws.get_entity_by_netid("javerage").uwnetid, "javerage")
+            self.assertEqual(pws.get_person_by_regid(
+                "FBB38FE46A7C11D5A4AE0004AC494FFE").uwnetid, "bill")
+            pws.get_idcard_photo("9136CCB8F66711D5BE060004AC494FFE")
+            self.assertEqual(get.call_count, 0)
+
+    def test_errors(self):
+        with self.assertLogs("uw_pws.warm", "WARNING") as logs:
+            report = warm(PWS(), ["javerage", "nobody", "not a netid!"],
+                          entities=False)
+        self.assertEqual(report.keys, 3)
+        self.assertEqual(report.errors, 2)
+        self.assertEqual(len(logs.output), 2)
+        self.assertTrue(any("nobody" in line and "404" in line for (
+            line) in logs.output))
+
+    def test_rate_and_progress(self):
+        reports = []
+        start = time.monotonic()
+        report = warm(PWS(), ["javerage"] * 6, entities=False, workers=2,
+                      rate=50, progress=reports.append, progress_seconds=0)
+        self.assertTrue(time.monotonic() - start >= 0.1)
+        self.assertEqual(report.keys, 6)
+        self.assertEqual(len(reports), 7)
+        self.assertEqual(reports[-1], report)
+        self.assertTrue(report.rate > 0)
+
+    def test_search_keys(self):
+        self.assertEqual(
+            list(search_keys(PWS(), changed_since_date=2019)),
+            ["javerage", "phil"])
+
+    def test_read_keys(self):
+        self.assertEqual(list(read_keys([
+            "javerage\n", "\n", "# staff\n",
+            "FBB38FE46A7C11D5A4AE0004AC494FFE  # bill\n"])),
+            ["javerage", "FBB38FE46A7C11D5A4AE0004AC494FFE"])
+
+    def test_main_needs_shared_cache(self):
+        with patch("uw_pws.load.use_settings"), patch(
+                "sys.stderr", new_callable=StringIO) as stderr, patch.object(
+                PWS, "get_person_by_netid") as get_person:
+            self.assertRaises(SystemExit, main, ["javerage"])
+        self.assertIn("RESTCLIENTS_DAO_CACHE_CLASS", stderr.getvalue())
+        get_person.assert_not_called()
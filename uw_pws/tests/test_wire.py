@@ -0,0 +1,109 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import datetime
+from unittest import TestCase
+import json
+import pickle
+from uw_pws import PWS
+from uw_pws.models import Person, Position, Entity
+from uw_pws.util import fdao_pws_override
+
+NETIDS = ("javerage", "bill", "finals1", "finals2", "none", "eight",
+          "jbothell", "jinternational", "jnewstudent", "phil", "posttos")
+
+
+@fdao_pws_override
+class TestWireFormat(TestCase):
+
+    def _assert_person_equal(self, person, copy):
+        self.assertEqual(copy.json_data(), person.json_data())
+        self.assertEqual(copy.prior_uwnetids, person.prior_uwnetids)
+        self.assertEqual(copy.prior_uwregids, person.prior_uwregids)
+        self.assertEqual(copy.is_student, person.is_student)
+        self.assertEqual(copy.is_staff, person.is_staff)
+        self.assertEqual(copy.is_employee, person.is_employee)
+        self.assertEqual(copy.is_alum, person.is_alum)
+        self.assertEqual(copy.is_faculty, person.is_faculty)
+
+    def test_person(self):
+        pws = PWS()
+        for netid in NETIDS:
+            person = pws.get_person_by_netid(netid)
+            data = person.to_bytes()
+            self._assert_person_equal(person, Person.from_bytes(data))
+
+            self.assertLess(len(data), len(pickle.dumps(person.json_data())))
+            raw = pws._get_resource_data(
+                "/identity/v2/person/{}/full.json".format(netid))
+            self.assertLess(len(data), len(raw))
+
+    def test_person_values(self):
+        person = Person(uwnetid="jé", display_name="",
+                        repository_time_stamp=datetime(2020, 1, 2, 3, 4),
+                        employee_state="retired", student_state="current",
+                        whitepages_publish=False, is_faculty=True)
+        person.touch_dials = None
+        person.positions.append(Position(department="D", title=None))
+        copy = Person.from_bytes(person.to_bytes())
+        self._assert_person_equal(person, copy)
+        self.assertEqual(copy.repository_time_stamp,
+                         datetime(2020, 1, 2, 3, 4))
+        self.assertIsNone(copy.positions[0].is_primary)
+        self.assertIsNone(copy.touch_dials)
+
+        self.assertEqual(Person.from_bytes(Person().to_bytes()).json_data(),
+                         Person().json_data())
+
+    def test_position(self):
+        position = Position.from_json({"EWPDept": "Family Medicine",
+                                       "EWPTitle": "Retiree",
+                                       "Primary": True})
+        copy = Position.from_bytes(position.to_bytes())
+        self.assertEqual(copy.json_data(), position.json_data())
+        self.assertTrue(copy.is_retiree())
+
+    def test_entity(self):
+        pws = PWS()
+        for netid in ("javerage", "somalt"):
+            entity = pws.get_entity_by_netid(netid)
+            copy = Entity.from_bytes(entity.to_bytes())
+            self.assertEqual(copy.json_data(), entity.json_data())
+            self.assertEqual(copy.prior_uwnetids, entity.prior_uwnetids)
+
+    def test_errors(self):
+        data = Entity(uwnetid="somalt").to_bytes()
+        self.assertRaises(ValueError, Person.from_bytes, data)
+        self.assertRaises(ValueError, Entity.from_bytes, b"\x01" + data[1:])
+        self.assertRaises(ValueError, Entity.from_bytes, data[:-7])
+        self.assertRaises(ValueError, Entity.from_bytes, b"")
+        self.assertRaises(ValueError, Person(uwnetid="a\x00b").to_bytes)
+        self.assertRaises(ValueError, Person(uwnetid=object()).to_bytes)
+
+        entity = Entity()
+        entity.prior_uwnetids = ["a"] * 0xFFFF
+        self.assertRaises(ValueError, entity.to_bytes)
+        entity.prior_uwnetids.pop()
+        self.assertEqual(len(Entity.from_bytes(
+            entity.to_bytes()).prior_uwnetids), 0xFFFE)
+
+    def test_types(self):
+        person = Person(uwnetid="javerage", employee_id=123456789,
+                        repository_time_stamp=1577836800)
+        person.phones = ["206 555-1212", 2065551313, None]
+        person.addresses = [{"Line1": "Box 1", "Line2": None}]
+        person.positions.append(Position(department=7, title="Cook"))
+        copy = Person.from_bytes(person.to_bytes())
+        self._assert_person_equal(person, copy)
+        self.assertIs(type(copy.employee_id), int)
+        self.assertEqual(copy.repository_time_stamp, 1577836800)
+        self.assertEqual(copy.phones, ["206 555-1212", 2065551313, None])
+        self.assertEqual(copy.addresses, [{"Line1": "Box 1", "Line2": None}])
+        self.assertEqual(copy.positions[0].department, 7)
+
+    def test_descriptors(self):
+        # Values are set through the model fields, as from_json sets them
+        copy = Entity.from_bytes(Entity(uwnetid="somalt").to_bytes())
+        self.assertEqual(copy.uwnetid, "somalt")
+        self.assertEqual({ref().__class__.__name__ for ref in (
+            copy._dynamic_fields)}, {"CharField", "BooleanField"})
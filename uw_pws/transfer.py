@@ -0,0 +1,148 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compressed transfer of PWS responses, and counts of the bytes transferred.
+"""
+
+from importlib.util import find_spec
+import zlib
+
+# Size of the compressed chunks fed to the decompressor
+CHUNK_SIZE = 64 * 1024
+
+_byte_counters = None
+
+
+def accept_encoding(setting):
+    """
+    Returns the Accept-Encoding header value for the ACCEPT_ENCODING
+    setting: True for every encoding that can be decoded here, or a header
+    value.
+    """
+    if setting is True or str(setting).lower() == "true":
+        return "gzip, br" if _has_brotli() else "gzip"
+    return setting
+
+
+def decode_response(response):
+    """
+    Returns the body of a 200 response, decompressed, and counts the
+    transferred and decoded bytes of a compressed one.  Raises ValueError
+    for an encoding that can't be decoded here.  urllib3 responses have been
+    decompressed as they were read, while others, such as mock responses,
+    are decompressed here.  A body cached from a urllib3 response keeps
+    its Content-Encoding header, but was cached decoded, so a body that
+    isn't in the encoding is returned as it is.
+    """
+    data = response.data
+    encoding = (_get_header(response, "Content-Encoding") or "").lower()
+    if not encoding or encoding == "identity":
+        return data
+    if encoding == "br":
+        # urllib3 leaves br undecoded when brotli isn't installed, so
+        # check here, raising ValueError
+        _import_brotli()
+
+    if getattr(response, "decode_content", False):
+        # urllib3 counts the compressed bytes it read
+        wire_bytes = response.tell() if hasattr(response, "tell") else (
+            len(data))
+    else:
+        wire_bytes = len(data)
+        data = _decode(data, encoding)
+
+    observe_bytes(encoding, wire_bytes, len(data))
+    return data
+
+
+def decompress(data, encoding):
+    """
+    Returns data decompressed from encoding, decompressing it a chunk at a
+    time into one buffer.
+    """
+    if encoding == "br":
+        brotli = _import_brotli()
+        decompressor = brotli.Decompressor()
+        decompress_chunk = getattr(decompressor, "process", None) or (
+            decompressor.decompress)
+    elif encoding in ("gzip", "x-gzip"):
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        decompress_chunk = decompressor.decompress
+    elif encoding == "deflate":
+        # Should be zlib wrapped, but some servers send raw deflate
+        decompressor = zlib.decompressobj(
+            zlib.MAX_WBITS if data[:1] == b"\x78" else -zlib.MAX_WBITS)
+        decompress_chunk = decompressor.decompress
+    else:
+        raise ValueError("Unsupported Content-Encoding: {}".format(encoding))
+
+    view = memoryview(data)
+    out = bytearray()
+    for start in range(0, len(view), CHUNK_SIZE):
+        out += decompress_chunk(view[start:start + CHUNK_SIZE])
+    if hasattr(decompressor, "flush"):
+        out += decompressor.flush()
+    if encoding != "br" and not decompressor.eof:
+        raise zlib.error("Incomplete {} stream".format(encoding))
+    return bytes(out)
+
+
+def _decode(data, encoding):
+    """
+    Returns data decompressed from encoding, or data as it is if it isn't
+    in the encoding.
+    """
+    if encoding in ("gzip", "x-gzip"):
+        return decompress(data, encoding) if (
+            data[:2] == b"\x1f\x8b") else data
+
+    # Deflate and brotli streams may have no header, so are tried
+    errors = (_import_brotli().error,) if encoding == "br" else (zlib.error,)
+    try:
+        return decompress(data, encoding)
+    except errors:
+        return data
+
+
+def observe_bytes(encoding, wire_bytes, decoded_bytes):
+    """
+    Counts the bytes of a response as transferred, and as decoded, in the
+    restclient_pws_response_bytes counter, labelled by Content-Encoding.
+    """
+    global _byte_counters
+    if _byte_counters is None:
+        from prometheus_client import Counter
+        _byte_counters = Counter(
+            'restclient_pws_response_bytes',
+            'PWS response body bytes, as transferred and as decoded',
+            ['encoding', 'stage'])
+    _byte_counters.labels(encoding, "transferred").inc(wire_bytes)
+    _byte_counters.labels(encoding, "decoded").inc(decoded_bytes)
+
+
+def _get_header(response, name):
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get(name)
+    if value is None:
+        for key in headers:
+            if key.lower() == name.lower():
+                return headers[key]
+    return value
+
+
+def _has_brotli():
+    return find_spec("brotli") is not None or (
+        find_spec("brotlicffi") is not None)
+
+
+def _import_brotli():
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            raise ValueError(
+                "Unsupported Content-Encoding: br (brotli is not installed)")
+    return brotli
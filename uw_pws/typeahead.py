@@ -0,0 +1,244 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+An in-process index of persons for name and netid typeahead, answering
+without a person_search:
+
+    index = PersonIndex(pws.person_search(home_dept="COMPUTING"))
+    index.search("jam ave")
+
+    # Later, apply the persons changed since the index was built
+    index.update(pws.person_search(changed_since_date=since))
+"""
+
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+import re
+import threading
+import unicodedata
+
+DEFAULT_LIMIT = 10
+
+# Name fields whose words are indexed, along with the uwnetid
+NAME_FIELDS = ("display_name", "preferred_first_name",
+               "preferred_middle_name", "preferred_surname", "first_name",
+               "surname", "full_name")
+
+_RE_SEPARATOR = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """
+    Returns the words of text, case folded and without accents.
+    """
+    if not text:
+        return []
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if (
+            not unicodedata.combining(c)))
+    return [word for word in _RE_SEPARATOR.split(text.casefold()) if word]
+
+
+class PersonIndex(object):
+    """
+    Persons indexed by the words of their uwnetid and names.  The distinct
+    words are kept sorted, so the words starting with a prefix are found
+    by bisection, and each word has a posting list of the persons with it,
+    sorted by name.  Persons are added and replaced by uwregid.
+    """
+    def __init__(self, persons=()):
+        self._persons = {}
+        self._words = {}
+        self._names = {}
+        self._netids = {}
+        self._sorted_words = []
+        self._postings = {}
+        self._lock = threading.Lock()
+        self.update(persons)
+
+    def update(self, persons):
+        """
+        Adds persons, replacing any already indexed with the same uwregid.
+        """
+        persons = {person.uwregid.upper(): person for person in persons if (
+            person.uwregid)}
+        with self._lock:
+            if not self._persons:
+                # Building, so sort once rather than insert each entry
+                postings = self._postings
+                for regid, person in persons.items():
+                    name, words = self._remember(regid, person)
+                    entry = (name, regid)
+                    for word in words:
+                        if word in postings:
+                            postings[word].append(entry)
+                        else:
+                            postings[word] = [entry]
+                for posting in postings.values():
+                    posting.sort()
+                self._sorted_words = sorted(postings)
+                return
+
+            for regid, person in persons.items():
+                self._remove(regid)
+                name, words = self._remember(regid, person)
+                entry = (name, regid)
+                for word in words:
+                    posting = self._postings.get(word)
+                    if posting is None:
+                        self._postings[word] = [entry]
+                        insort(self._sorted_words, word)
+                    else:
+                        insort(posting, entry)
+
+    def add(self, person):
+        self.update([person])
+
+    def remove(self, regid):
+        """
+        Removes the person with the uwregid, if indexed.
+        """
+        with self._lock:
+            self._remove(regid.upper())
+
+    def search(self, query, limit=DEFAULT_LIMIT, prefix=True):
+        """
+        Returns up to limit persons with a word starting with each word of
+        query, or with prefix False, a word equal to each.  The person
+        whose uwnetid is the query comes first.  The rest are ordered by
+        the query word matching the fewest persons: those with a word equal
+        to it, by name, then those with longer words starting with it.
+        """
+        words = normalize(query)
+        if not words or limit <= 0:
+            return []
+
+        with self._lock:
+            netid_regid = self._netids.get(query.strip().casefold())
+            if len(words) == 1:
+                regids = self._search_word(words[0], limit, prefix)
+            else:
+                regids = self._search_words(words, limit, prefix)
+
+            if netid_regid is not None:
+                regids = [netid_regid] + [
+                    regid for regid in regids if regid != netid_regid]
+            return [self._persons[regid] for regid in regids[:limit]]
+
+    def __len__(self):
+        return len(self._persons)
+
+    def __contains__(self, regid):
+        return regid.upper() in self._persons
+
+    def _search_word(self, word, limit, prefix):
+        """
+        Returns up to limit + 1 uwregids with a word matching word.
+        """
+        regids = []
+        for regid in self._ranked(word, prefix):
+            regids.append(regid)
+            if len(regids) > limit:
+                break
+        return regids
+
+    def _search_words(self, words, limit, prefix):
+        """
+        Returns up to limit + 1 uwregids with a word matching each of
+        words, in the order of the word matching the fewest persons, whose
+        matches are checked for the others.
+        """
+        fewest = self._fewest(words, prefix)
+        if fewest is None:
+            return []
+
+        # Each person's words are kept as " word word ... ", so a word is
+        # matched by a substring search
+        needles = [" {}{}".format(word, "" if prefix else " ") for (
+            word) in words if word != fewest]
+
+        regids = []
+        for regid in self._ranked(fewest, prefix):
+            text = self._words[regid]
+            if all(needle in text for needle in needles):
+                regids.append(regid)
+                if len(regids) > limit:
+                    break
+        return regids
+
+    def _fewest(self, words, prefix):
+        """
+        Returns the word of words matching the fewest persons, or None if
+        one matches none.  The postings of each word's matches are counted
+        in turn, always adding to the lowest count, until a word's are all
+        counted.
+        """
+        counts = [(0, i, self._matching_words(word, prefix)) for (
+            i, word) in enumerate(words)]
+        while True:
+            count, i, matches = heappop(counts)
+            match = next(matches, None)
+            if match is None:
+                return words[i] if count else None
+            heappush(counts, (count + len(self._postings[match]), i, matches))
+
+    def _ranked(self, word, prefix):
+        """
+        Yields the uwregids with a word equal to word, by name, then those
+        with longer words starting with it, by word and name.
+        """
+        seen = set()
+        for match in self._matching_words(word, prefix):
+            for name, regid in self._postings[match]:
+                if regid not in seen:
+                    seen.add(regid)
+                    yield regid
+
+    def _matching_words(self, word, prefix):
+        """
+        Yields the indexed words equal to word, or starting with it.
+        """
+        sorted_words = self._sorted_words
+        for i in range(bisect_left(sorted_words, word), len(sorted_words)):
+            match = sorted_words[i]
+            if match != word and not (prefix and match.startswith(word)):
+                return
+            yield match
+
+    def _remember(self, regid, person):
+        """
+        Keeps the person and its words, and returns the name it's sorted by
+        in posting lists, and its words.
+        """
+        netid = person.uwnetid
+        words = set(normalize(netid))
+        for name in NAME_FIELDS:
+            words.update(normalize(getattr(person, name)))
+
+        name = (person.display_name or person.full_name or "").casefold()
+        self._persons[regid] = person
+        self._words[regid] = " {} ".format(" ".join(words))
+        self._names[regid] = name
+        if netid:
+            self._netids[netid.casefold()] = regid
+        return name, words
+
+    def _remove(self, regid):
+        person = self._persons.pop(regid, None)
+        if person is None:
+            return
+
+        netid = person.uwnetid
+        if netid and self._netids.get(netid.casefold()) == regid:
+            del self._netids[netid.casefold()]
+
+        entry = (self._names.pop(regid), regid)
+        for word in self._words.pop(regid).split():
+            posting = self._postings[word]
+            i = bisect_left(posting, entry)
+            if i < len(posting) and posting[i] == entry:
+                del posting[i]
+            if not posting:
+                del self._postings[word]
+                del self._sorted_words[bisect_left(self._sorted_words, word)]
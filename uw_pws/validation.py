@@ -0,0 +1,79 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Identifier formats accepted by the Person Web Service, and batch validation
+of identifier sequences.
+"""
+
+from collections import namedtuple
+import re
+import sys
+
+# netid format:
+#     https://wiki.cac.washington.edu/display/SMW/UW+NetID+Namespace
+RE_NETID = re.compile(r'^[a-z][a-z0-9\-\_\.]{,127}$', re.I)
+RE_REGID = re.compile(r'^[A-F0-9]{32}$', re.I)
+RE_EMPLOYEE_ID = re.compile(r'^\d{9}$')
+RE_STUDENT_NUMBER = re.compile(r'^\d{7}$')
+RE_STUDENT_SYSTEM_KEY = re.compile(r'^\d{9}$')
+RE_PROX_RFID = re.compile(r'^\d{16}$')
+
+ValidationResult = namedtuple("ValidationResult", ["mask", "valid", "invalid"])
+ValidationResult.__doc__ = """
+The outcome of validating a sequence of identifiers: a boolean mask in
+input order, the normalized valid values, and the invalid values.
+"""
+
+
+def validate_batch(values, pattern, normalize=None):
+    """
+    Validates each of values against pattern in a single pass.  The valid
+    values are normalized with normalize, if given, and are the values as
+    given otherwise.  pandas Series are matched with their own string
+    operations and give Series, anything else, NumPy arrays included,
+    gives lists.
+    """
+    if _is_series(values):
+        return _validate_series(values, pattern, normalize)
+
+    match = pattern.match
+    mask = []
+    valid = []
+    invalid = []
+    for value in values:
+        if value is None:
+            mask.append(False)
+            invalid.append(value)
+            continue
+
+        string = value if type(value) is str else str(value)
+        if match(string) is not None:
+            mask.append(True)
+            valid.append(normalize(string) if normalize else value)
+        else:
+            mask.append(False)
+            invalid.append(value)
+    return ValidationResult(mask, valid, invalid)
+
+
+def _validate_series(values, pattern, normalize):
+    # object dtype keeps matching on Python's re, as the single validators
+    # do, rather than a pyarrow regex engine
+    strings = values.astype(str).astype(object)
+    mask = values.notna() & strings.str.match(
+        pattern.pattern, flags=pattern.flags)
+    valid = values[mask] if normalize is None else strings[mask]
+    if normalize is str.lower:
+        valid = valid.str.lower()
+    elif normalize is str.upper:
+        valid = valid.str.upper()
+    elif normalize is not None:
+        valid = valid.map(normalize)
+    return ValidationResult(mask, valid, values[~mask])
+
+
+def _is_series(values):
+    # Only loaded libraries can have produced values of their types
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(values, pd.Series)
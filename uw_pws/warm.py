@@ -0,0 +1,200 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Warms the configured caches with the persons, entities and photos of a known
+population, so that a newly started client doesn't send its first wave of
+traffic to PWS.  Keys are uwnetids or uwregids, given, read from a file, or
+found by a person search:
+
+    python -m uw_pws.warm --settings pws.cfg --file netids.txt --rate 50
+    python -m uw_pws.warm --settings pws.cfg --search \\
+        edupersonaffiliation_faculty=true --photos medium
+"""
+
+from collections import namedtuple
+from contextvars import copy_context
+from itertools import chain
+from logging import getLogger
+import argparse
+import sys
+import threading
+import time
+
+WARM_WORKERS = 4
+PROGRESS_SECONDS = 5.0
+
+logger = getLogger(__name__)
+
+WarmReport = namedtuple("WarmReport", [
+    "keys", "requests", "errors", "seconds", "rate"])
+
+
+def read_keys(lines):
+    """
+    Yields the uwnetids and uwregids in lines, one a line, skipping blank
+    lines and # comments.
+    """
+    for line in lines:
+        key = line.split("#", 1)[0].strip()
+        if key:
+            yield key
+
+
+def search_keys(pws, **kwargs):
+    """
+    Yields the uwnetids of the persons found by person_search(**kwargs),
+    a page at a time.
+    """
+    for persons, cursor in pws.person_search_pages(**kwargs):
+        for person in persons:
+            if person.uwnetid:
+                yield person.uwnetid
+
+
+def warm(pws, keys, entities=True, photo_sizes=(), workers=WARM_WORKERS,
+         rate=None, progress=None, progress_seconds=PROGRESS_SECONDS,
+         clock=time.monotonic):
+    """
+    Gets the person for each of keys, and its entity and photos in each of
+    photo_sizes, through pws, and returns a WarmReport.  Keys are warmed
+    on up to workers threads, and at most rate keys a second when given.
+    A key that fails counts one error, logged as a warning, and the rest
+    are still warmed.  progress is called with a WarmReport of the keys
+    warmed so far every progress_seconds, and once more when all are.
+    """
+    counts = {"keys": 0, "requests": 0, "errors": 0}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def warm_key(key):
+        requests = 0
+        try:
+            if pws.valid_uwregid(key):
+                requests += 1
+                person = pws.get_person_by_regid(key)
+                if entities:
+                    requests += 1
+                    pws.get_entity_by_regid(key)
+            else:
+                requests += 1
+                person = pws.get_person_by_netid(key)
+                if entities:
+                    requests += 1
+                    pws.get_entity_by_netid(key)
+
+            for size in photo_sizes:
+                requests += 1
+                pws.get_idcard_photo(person.uwregid, size)
+            error = 0
+        except Exception as ex:
+            logger.warning("Warming {} failed: {}".format(key, ex))
+            error = 1
+        finally:
+            slots.release()
+
+        with lock:
+            counts["keys"] += 1
+            counts["requests"] += requests
+            counts["errors"] += error
+
+    def report():
+        seconds = clock() - start
+        with lock:
+            return WarmReport(
+                counts["keys"], counts["requests"], counts["errors"],
+                seconds, counts["keys"] / seconds if seconds else 0.0)
+
+    from concurrent.futures import ThreadPoolExecutor
+    start = clock()
+    reported = start
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i, key in enumerate(keys):
+            if rate:
+                wait = start + i / rate - clock()
+                if wait > 0:
+                    time.sleep(wait)
+
+            slots.acquire()
+            executor.submit(copy_context().run, warm_key, key)
+
+            if progress is not None and clock() - reported >= (
+                    progress_seconds):
+                reported = clock()
+                progress(report())
+
+    final = report()
+    if progress is not None:
+        progress(final)
+    return final
+
+
+def format_report(report):
+    return ("keys: {}, requests: {}, errors: {}, seconds: {:.2f}, "
+            "keys/s: {:.1f}").format(
+        report.keys, report.requests, report.errors, report.seconds,
+        report.rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0], epilog=(
+            "The in-process caches are gone when the command exits, so "
+            "this warms only a restclients cache shared with the clients "
+            "(RESTCLIENTS_DAO_CACHE_CLASS), such as a memcached one."))
+    parser.add_argument("keys", nargs="*", help="uwnetids and uwregids")
+    parser.add_argument("--file",
+                        help="file of uwnetids and uwregids, one a line, or "
+                             "- for stdin")
+    parser.add_argument("--search", nargs="+", metavar="PARAM=VALUE",
+                        help="person_search params finding the keys")
+    parser.add_argument("--settings",
+                        help="config file with a [PWS] section of settings")
+    parser.add_argument("--pws-host",
+                        help="PWS to use instead of the settings")
+    parser.add_argument("--no-entities", action="store_true",
+                        help="warm persons only")
+    parser.add_argument("--photos", nargs="+", default=[], metavar="SIZE",
+                        help="photo sizes to warm")
+    parser.add_argument("--workers", type=int, default=WARM_WORKERS)
+    parser.add_argument("--rate", type=float,
+                        help="most keys warmed a second")
+    args = parser.parse_args(argv)
+
+    from commonconf import override_settings
+    from uw_pws.load import pws_host_settings, use_settings
+    use_settings(args.settings)
+
+    overrides = {}
+    if args.pws_host:
+        overrides = pws_host_settings(args.pws_host, args.workers)
+
+    from uw_pws import PWS
+    with override_settings(**overrides):
+        pws = PWS()
+        from restclients_core.cache import NoCache
+        if isinstance(pws.dao.get_cache(), NoCache):
+            parser.error("no restclients cache to warm: set "
+                         "RESTCLIENTS_DAO_CACHE_CLASS to a shared cache")
+
+        keys = list(args.keys)
+        if args.file == "-":
+            keys.extend(read_keys(sys.stdin))
+        elif args.file:
+            with open(args.file) as lines:
+                keys.extend(read_keys(lines))
+
+        if args.search:
+            params = dict(param.split("=", 1) for param in args.search)
+            keys = chain(keys, search_keys(pws, **params))
+
+        report = warm(
+            pws, keys, entities=not args.no_entities,
+            photo_sizes=args.photos, workers=args.workers, rate=args.rate,
+            progress=lambda report: print(
+                format_report(report), file=sys.stderr))
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
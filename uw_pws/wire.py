@@ -0,0 +1,155 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Primitives for the compact binary encoding of PWS models, used by their
+to_bytes and from_bytes methods.
+
+A record is laid out as:
+    version (1 byte), kind (1 byte),
+    a fixed header specific to the kind (struct packed),
+    a bitmap of which text slots are None,
+    a bitmap of which text slots are JSON encoded,
+    the text slots, utf-8 encoded and NUL separated.
+Booleans, affiliation flags and affiliation states are packed into the
+header, so only free text is stored as text.  Slot values that aren't
+strings are stored as JSON, so they decode to the same types.
+"""
+
+from datetime import datetime
+import json
+import struct
+
+VERSION = 2
+
+PERSON = ord("P")
+POSITION = ord("O")
+ENTITY = ord("E")
+
+# Tri-state codes for nullable booleans
+TRISTATE = (None, False, True)
+
+# Interned affiliation states, with OTHER_STATE stored as text
+STATES = (None, "current", "prior")
+OTHER_STATE = 3
+
+# Codes for timestamps
+TIMESTAMP_NONE = 0
+TIMESTAMP_TEXT = 1
+TIMESTAMP_DATETIME = 2
+
+NO_LIST = 0xFFFF
+
+_SEPARATOR = "\x00"
+
+
+def tristate(value):
+    return 0 if value is None else 2 if value else 1
+
+
+def state(value):
+    try:
+        return STATES.index(value)
+    except ValueError:
+        return OTHER_STATE
+
+
+def list_count(values):
+    """
+    Returns the header count for a list of slot values, or NO_LIST for
+    None.
+    """
+    if values is None:
+        return NO_LIST
+    if len(values) >= NO_LIST:
+        raise ValueError("Lists are limited to {} values".format(
+            NO_LIST - 1))
+    return len(values)
+
+
+def timestamp(value):
+    """
+    Returns the code and text slots for a timestamp.
+    """
+    if value is None:
+        return TIMESTAMP_NONE, []
+    if isinstance(value, datetime):
+        return TIMESTAMP_DATETIME, [value.isoformat()]
+    return TIMESTAMP_TEXT, [value]
+
+
+def from_timestamp(code, text):
+    if code == TIMESTAMP_DATETIME:
+        return datetime.fromisoformat(text)
+    return text
+
+
+def pack(kind, header_format, header, slots):
+    """
+    Returns the encoded record for a kind, its header values and its text
+    slots.
+    """
+    bitmap = 0
+    json_bitmap = 0
+    text = []
+    for i, value in enumerate(slots):
+        if value is None:
+            bitmap |= 1 << i
+            text.append("")
+        elif type(value) is str:
+            text.append(value)
+        else:
+            json_bitmap |= 1 << i
+            try:
+                text.append(json.dumps(value, separators=(",", ":")))
+            except TypeError:
+                raise ValueError("Cannot encode {!r}".format(value))
+
+    joined = _SEPARATOR.join(text)
+    if joined.count(_SEPARATOR) != max(len(text) - 1, 0):
+        raise ValueError("Text values cannot contain NUL characters")
+
+    size = (len(slots) + 7) // 8
+    return b"".join((
+        bytes((VERSION, kind)),
+        struct.pack(header_format, *header),
+        bitmap.to_bytes(size, "little"),
+        json_bitmap.to_bytes(size, "little"),
+        joined.encode("utf-8")))
+
+
+def unpack_header(data, kind, header_format):
+    """
+    Returns the header values of an encoded record, and the offset of the
+    slot bitmaps.
+    """
+    if len(data) < 2 or data[0] != VERSION or data[1] != kind:
+        raise ValueError("Not a version {} {} record".format(
+            VERSION, chr(kind)))
+    return (struct.unpack_from(header_format, data, 2),
+            2 + struct.calcsize(header_format))
+
+
+def unpack_slots(data, offset, count):
+    """
+    Returns the count slots of an encoded record, starting at the slot
+    bitmaps offset.
+    """
+    size = (count + 7) // 8
+    bitmap = int.from_bytes(data[offset:offset + size], "little")
+    json_bitmap = int.from_bytes(
+        data[offset + size:offset + 2 * size], "little")
+    if not count:
+        return []
+
+    text = bytes(data[offset + 2 * size:]).decode("utf-8").split(_SEPARATOR)
+    if len(text) != count:
+        raise ValueError("Expected {} values, found {}".format(
+            count, len(text)))
+    if bitmap:
+        text = [None if bitmap >> i & 1 else value for (
+            i, value) in enumerate(text)]
+    if json_bitmap:
+        text = [json.loads(value) if json_bitmap >> i & 1 else value for (
+            i, value) in enumerate(text)]
+    return text